@@ -9,11 +9,16 @@ except ImportError:
 import streamlit as st
 import pandas as pd
 from pathlib import Path
-from parser import parse_folder
-from scoring import score_dataframe, summarize
+from parser import ingest_folder, is_archive, iter_parse_archive, parse_bytes, source_file, IngestResult
+from parse_cache import ParseCache
+from records import ParsedResume, records_to_frame
+from text_store import FileTextStore, load_raw_text, offload_frame, offload_raw_text
+from dedup import DEFAULT_THRESHOLD, DuplicateDetector
+from scoring import refine_frame_domains, score_dataframe, summarize
 from db_handler import ResumeDB
-import io, json, ast
-from typing import Any, Dict
+import io, json, ast, hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
 from auth import show_login_register_page  # ✅ Login/Register UI
 
 # ------------------- PAGE CONFIG -------------------
@@ -41,6 +46,31 @@ def init_db():
 
 db = init_db()
 
+@st.cache_resource
+def init_parse_cache():
+    return ParseCache(Path(".parse_cache"))
+
+parse_cache = init_parse_cache()
+
+@st.cache_resource
+def init_upload_writer():
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="upload-writer")
+
+upload_writer = init_upload_writer()
+
+@st.cache_resource
+def init_domain_refiner():
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="domain-refiner")
+
+domain_refiner = init_domain_refiner()
+
+@st.cache_resource
+def init_text_store():
+    # raw_text is kept here; session rows only carry raw_text_ref
+    return FileTextStore(Path(".parse_cache") / "text_store")
+
+text_store = init_text_store()
+
 # ------------------- LOGIN HANDLING -------------------
 if "logged_in" not in st.session_state:
     st.session_state["logged_in"] = False
@@ -83,11 +113,28 @@ with st.sidebar:
                       placeholder="Looking for a Python developer with Flask, Docker, AWS...")
     uploaded = None
     if data_source == "Upload New Files":
-        uploaded = st.file_uploader("Upload Resume(s)", type=["pdf", "docx", "txt"], accept_multiple_files=True)
+        uploaded = st.file_uploader("Upload Resume(s)", type=["pdf", "docx", "txt", "zip"], accept_multiple_files=True)
+        keep_uploads = st.checkbox("Keep a copy of uploads on disk", value=True)
+
+    parse_workers, parse_timeout = 1, None
+    if data_source == "Use Included Dataset":
+        if st.checkbox("⚡ Parallel parsing", value=False):
+            parse_workers = st.slider("Worker processes", 2, max(2, os.cpu_count() or 2), min(4, max(2, os.cpu_count() or 2)))
+            parse_timeout = st.number_input("Per-file timeout (seconds)", min_value=5, max_value=600, value=60)
+    page_workers = st.slider("Processes per long PDF", 1, max(2, os.cpu_count() or 1), 1,
+                             help="PDFs with many pages have their pages extracted in this many processes "
+                                  "(sequential parsing only)")
+    dedup_threshold = None
+    if st.checkbox("Flag near-duplicate resumes", value=False,
+                   help="Resumes nearly identical to one already parsed are flagged and reuse its score"):
+        dedup_threshold = st.slider("Near-duplicate similarity threshold", 0.70, 1.00, DEFAULT_THRESHOLD, 0.01)
 
     st.divider()
     parse_btn = st.button("🔍 Parse Resume(s)", use_container_width=True)
     score_btn = st.button("📈 Score & Skill Gap", use_container_width=True)
+    refine_domains = st.checkbox("🌐 Refine project domains with web search", value=False,
+                                 help="Scoring uses the offline classifier; this refines its project "
+                                      "domains with web searches in the background afterwards")
 
     st.divider()
     st.subheader("💾 Database Options")
@@ -95,6 +142,7 @@ with st.sidebar:
 
     if st.button("🗑️ Clear Session Data", use_container_width=True):
         st.session_state["df"] = pd.DataFrame()
+        st.session_state["dedup"] = None
         st.rerun()
 
 # ------------------- SESSION STATE -------------------
@@ -106,16 +154,56 @@ if "scored_df" not in st.session_state:
     st.session_state["scored_df"] = pd.DataFrame()
 
 # ------------------- UTILITIES -------------------
-def save_uploads(files) -> Path:
-    uploads_dir.mkdir(parents=True, exist_ok=True)
+def duplicate_detector(threshold: Optional[float]) -> Optional[DuplicateDetector]:
+    """Per-session detector (None when dedup is off), rebuilt from the session rows when the threshold changes."""
+    if threshold is None:
+        return None
+    det = st.session_state.get("dedup")
+    if det is None or det.threshold != threshold:
+        det = DuplicateDetector(threshold)
+        session_df = st.session_state["df"]
+        if "minhash" in session_df.columns:
+            det.add_hex(zip(session_df["file"], session_df["minhash"]))
+        st.session_state["dedup"] = det
+    return det
+
+def parse_uploads(files, persist: bool = True, dedup: Optional[DuplicateDetector] = None,
+                  page_workers: int = 1) -> pd.DataFrame:
+    """Parse uploads straight from memory; copies to ./uploads are written in the background."""
+    if persist:
+        uploads_dir.mkdir(parents=True, exist_ok=True)
+    records = []
     for f in files:
-        (uploads_dir / f.name).write_bytes(f.read())
-    return uploads_dir
-
-def parse_if_exists(folder: Path) -> pd.DataFrame:
+        data = f.getvalue()
+        if persist:
+            upload_writer.submit((uploads_dir / f.name).write_bytes, data)
+        if is_archive(f.name):
+            # One row per resume in the zip, named "<zip>/<member>"
+            for record in iter_parse_archive(data, skills_path, archive_name=f.name,
+                                             cache=parse_cache, dedup=dedup, page_workers=page_workers):
+                records.append(offload_raw_text(record, text_store))
+            continue
+        try:
+            records.append(offload_raw_text(parse_bytes(data, f.name, skills_path, cache=parse_cache, dedup=dedup,
+                                                        page_workers=page_workers), text_store))
+        except Exception as e:
+            records.append(ParsedResume(f.name, error=str(e)))
+    return records_to_frame(records)
+
+def manifest_path_for(folder: Path) -> Path:
+    key = hashlib.sha1(str(folder.resolve()).encode()).hexdigest()[:16]
+    return Path(".parse_cache") / "manifests" / f"{key}.json"
+
+def parse_if_exists(folder: Path, workers: int = 1, timeout=None,
+                    dedup: Optional[DuplicateDetector] = None, page_workers: int = 1) -> Optional[IngestResult]:
+    """Incrementally parse a folder: only new/changed files (or ones missing from the session)."""
     if folder and folder.exists() and any(folder.iterdir()):
-        return parse_folder(folder, skills_path)
-    return pd.DataFrame()
+        session_df = st.session_state["df"]
+        known = session_df["file"].tolist() if "file" in session_df.columns else []
+        return ingest_folder(folder, skills_path, manifest_path=manifest_path_for(folder),
+                             known_files=known, workers=workers, timeout=timeout, cache=parse_cache,
+                             dedup=dedup, page_workers=page_workers)
+    return None
 
 def _maybe_parse_json_like(x: Any):
     if isinstance(x, str) and x.strip().startswith(("{", "[")):
@@ -179,12 +267,20 @@ with tab1:
 
     if parse_btn:
         frames = []
+        result = None
         if data_source == "Upload New Files" and uploaded:
-            save_uploads(uploaded)
-            frames.append(parse_if_exists(uploads_dir))
+            upload_df = parse_uploads(uploaded, persist=keep_uploads, dedup=duplicate_detector(dedup_threshold),
+                                      page_workers=page_workers)
+            # Re-uploaded files replace their previous rows
+            session_df = st.session_state["df"]
+            if "file" in session_df.columns:
+                st.session_state["df"] = session_df[~session_df["file"].map(source_file).isin(
+                    [source_file(f.name) for f in uploaded])]
+            frames.append(upload_df)
         elif data_source == "Use Included Dataset":
             if dataset_path.exists() and any(dataset_path.iterdir()):
-                frames.append(parse_if_exists(dataset_path))
+                result = parse_if_exists(dataset_path, workers=parse_workers, timeout=parse_timeout,
+                                         dedup=duplicate_detector(dedup_threshold), page_workers=page_workers)
             else:
                 st.warning("Dataset folder not found or empty.")
         elif data_source == "Load from MongoDB":
@@ -194,12 +290,37 @@ with tab1:
                     frames.append(db_df)
                 else:
                     st.warning("No resumes found in MongoDB.")
+
+        if result is not None:
+            session_df = st.session_state["df"]
+            # Changed files replace their old rows instead of being dropped as duplicates;
+            # deleted files lose their rows (and scores) altogether
+            stale = set(result.changed) | set(result.deleted)
+            if stale and "file" in session_df.columns:
+                st.session_state["df"] = session_df[~session_df["file"].map(source_file).isin(stale)]
+            scored_df = st.session_state.get("scored_df")
+            if result.deleted and scored_df is not None and "file" in scored_df.columns:
+                st.session_state["scored_df"] = scored_df[~scored_df["file"].map(source_file).isin(result.deleted)]
+            if result.deleted:
+                st.info(f"Removed from folder since last parse: {', '.join(result.deleted)}")
+            frames.append(result.records)
+
         if frames:
             new_df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+            new_df = offload_frame(new_df, text_store)
+            if "duplicate_of" in new_df.columns and new_df["duplicate_of"].notna().any():
+                st.info(f"{int(new_df['duplicate_of'].notna().sum())} near-duplicate resume(s) flagged; they reuse the original's score.")
             st.session_state["df"] = smart_concat(st.session_state["df"], new_df)
-            if save_to_db and db.is_connected() and data_source != "Load from MongoDB":
-                db.save_resumes_batch(st.session_state["df"])
-            st.success(f"Parsed {len(st.session_state['df'])} resumes.")
+            if save_to_db and db.is_connected() and data_source == "Upload New Files":
+                db.save_resumes_batch(new_df, text_source=text_store)
+            elif save_to_db and db.is_connected() and result is not None and result.changed \
+                    and "file" in new_df.columns:
+                db.save_resumes_batch(new_df[new_df["file"].map(source_file).isin(result.changed)], text_source=text_store)
+            if result is not None:
+                st.success(f"Parsed {len(result.changed)} new/changed resume(s), "
+                           f"{len(result.unchanged)} unchanged. {len(st.session_state['df'])} resumes in session.")
+            else:
+                st.success(f"Parsed {len(st.session_state['df'])} resumes.")
         else:
             st.warning("No resumes parsed yet.")
 
@@ -237,6 +358,9 @@ with tab2:
         with st.spinner("Analyzing skill gap..."):
             scored = score_dataframe(st.session_state["df"], jd)
             st.session_state["scored_df"] = scored.copy()
+            st.session_state["domain_refinement"] = (
+                domain_refiner.submit(refine_frame_domains, st.session_state["df"].copy())
+                if refine_domains else None)
 
             if save_to_db and db.is_connected():
                 for _, row in scored.iterrows():
@@ -250,6 +374,25 @@ with tab2:
     elif score_btn:
         st.warning("⚠️ Please provide a Job Description and parse resumes first.")
 
+    # ------------------- WEB DOMAIN REFINEMENT -------------------
+    refinement = st.session_state.get("domain_refinement")
+    if refinement is not None and not refinement.done():
+        st.caption("🌐 Refining project domains with web search in the background...")
+    elif refinement is not None:
+        st.session_state["domain_refinement"] = None
+        try:
+            refined = refinement.result()
+        except Exception as e:
+            st.warning(f"Web domain refinement failed: {e}")
+        else:
+            scored_df = st.session_state["scored_df"]
+            if "project_domains" in scored_df.columns:
+                scored_df = scored_df.copy()
+                scored_df["project_domains"] = [refined.get(f, d) for f, d in
+                                                zip(scored_df["file"], scored_df["project_domains"])]
+                st.session_state["scored_df"] = scored_df
+                st.info("Project domains refined with web search.")
+
     # ------------------- FILTER SECTION (TOP) -------------------
     if not st.session_state["scored_df"].empty:
 
@@ -322,7 +465,7 @@ if not st.session_state["df"].empty:
     if "skills" in selected_row:
         brief_details.append(f"**Skills**: {_format_list(selected_row['skills'])}")
 
-    raw_text = str(selected_row.get("raw_text", ""))
+    raw_text = load_raw_text(selected_row, text_store, db.text_store)
     if raw_text.strip():
         brief_summary = summarize(raw_text, max_sentences=1)
         brief_details.append(f"**Summary**: {brief_summary.split('.')[0]}.")
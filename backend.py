@@ -1,5 +1,7 @@
 import sys
 import os
+import re
+import threading
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from fastapi import FastAPI
 
@@ -10,30 +12,64 @@ def health_check():
     return {"status": "Backend is running"}
 
 from pathlib import Path
-from parser import parse_file
+from parser import (CORRUPT_DOCUMENT_ERRORS, DocumentTooLarge, parse_bytes, get_vocabulary,
+                    is_archive, iter_parse_archive)
+from parse_cache import ParseCache
+from text_store import MongoTextStore, offload_raw_text
+from dedup import DEFAULT_THRESHOLD, DuplicateDetector
+from nlp_models import get_nlp
+from domain_classifier import get_domain_classifier
+from search_cache import MongoSearchBackend, SearchCache, cached_search
+from enrichment import DEFAULT_MAX_WORKERS, DEFAULT_TIMEOUT, Enricher
 import scoring
-import json
 from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pymongo import MongoClient
+from pymongo.errors import PyMongoError
 from bson import ObjectId
-import shutil
 import requests
 from bs4 import BeautifulSoup
-import spacy
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 
-# Load skills.json path relative to backend.py location
+# skills.json path relative to backend.py location; the vocabulary itself is
+# shared with the parser through parser.get_vocabulary
 SKILLS_JSON_PATH = Path(os.path.dirname(os.path.abspath(__file__))) / "skills.json"
-with open(SKILLS_JSON_PATH) as f:
-    SKILLS_VOCAB = json.load(f)
 
 MONGO_URI = "mongodb://localhost:27017"
 client = MongoClient(MONGO_URI)
 db = client['resume_db']
 resumes_col = db['resumes']
 domain_keywords_col = db['domain_keywords']
+# raw_text is stored once per distinct text here; resumes keep raw_text_ref
+TEXT_STORE = MongoTextStore(db['resume_text'])
+# Search keyword lookups shared by every backend process; Mongo expires old entries
+SEARCH_CACHE = SearchCache.from_env(MongoSearchBackend(db['search_cache']))
+
+# Near-duplicate uploads reuse the stored score of the original. Resumes are
+# keyed by their Mongo _id, not the upload filename (which is neither unique
+# nor stable), and only signatures are held in memory. The detector is seeded
+# from the stored signatures on the first upload, not at import, so the
+# backend starts (and /health answers) without MongoDB.
+DEDUP_THRESHOLD = float(os.environ.get("DEDUP_THRESHOLD", DEFAULT_THRESHOLD))
+_DEDUP: Optional[DuplicateDetector] = None
+_DEDUP_LOCK = threading.Lock()
+
+def get_dedup() -> DuplicateDetector:
+    global _DEDUP
+    with _DEDUP_LOCK:
+        if _DEDUP is None:
+            det = DuplicateDetector(threshold=DEDUP_THRESHOLD)
+            try:
+                det.add_hex((str(d["_id"]), d["parsed_data"]["minhash"])
+                            for d in resumes_col.find({"parsed_data.minhash": {"$exists": True}},
+                                                      {"parsed_data.minhash": 1}))
+            except PyMongoError as e:
+                # Not kept: the next upload tries to seed again
+                print(f"⚠️ Could not load stored resume signatures: {e}")
+                return det
+            _DEDUP = det
+        return _DEDUP
 
 app = FastAPI(title="Dynamic Resume Parsing & Scoring Backend")
 app.add_middleware(
@@ -43,8 +79,14 @@ app.add_middleware(
 
 UPLOAD_DIR = Path("./uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
-
-nlp = spacy.load("en_core_web_sm")
+PARSE_CACHE = ParseCache(Path("./.parse_cache"))
+# Keep a copy of every upload on disk; written after the response, off the parse path
+PERSIST_UPLOADS = os.environ.get("PERSIST_UPLOADS", "1") != "0"
+# Processes used to extract the pages of long PDF uploads (1 = in the request's process)
+PDF_PAGE_WORKERS = int(os.environ.get("PDF_PAGE_WORKERS", "1"))
+# Project domains come from the offline classifier; with this set, a background
+# task refines them with web search after the response and updates the document
+WEB_DOMAIN_REFINEMENT = os.environ.get("WEB_DOMAIN_REFINEMENT", "0") != "0"
 
 # Copied from scoring.py for consistency
 COMMON_DOMAINS = [
@@ -54,15 +96,19 @@ COMMON_DOMAINS = [
     "computer vision", "deep learning",
 ]
 
+@cached_search(SEARCH_CACHE, "backend")
 def web_search_extract_keywords(query: str, top_n=3) -> List[str]:
     headers = {"User-Agent": "Mozilla/5.0"}
     search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
-    res = requests.get(search_url, headers=headers)
+    res = requests.get(search_url, headers=headers, timeout=WEB_SEARCH_TIMEOUT)
     soup = BeautifulSoup(res.text, 'html.parser')
     snippets = []
     for g in soup.find_all('div', class_='BNeawe s3v9rd AP7Wnd')[:top_n]:
         snippets.append(g.get_text())
     text_blob = " ".join(snippets)
+    nlp = get_nlp()
+    if nlp is None:
+        return list(set(scoring.tokenize(text_blob)))
     doc = nlp(text_blob)
     keywords = set()
     for chunk in doc.noun_chunks:
@@ -72,51 +118,49 @@ def web_search_extract_keywords(query: str, top_n=3) -> List[str]:
         keywords.add(ent.text.lower())
     return list(keywords)
 
+# Project searches run concurrently, capped, with identical in-flight queries merged
+WEB_SEARCH_TIMEOUT = float(os.environ.get("WEB_SEARCH_TIMEOUT", DEFAULT_TIMEOUT))
+WEB_ENRICHER = Enricher(lambda query, top_n: web_search_extract_keywords(query, top_n),
+                        max_workers=int(os.environ.get("WEB_SEARCH_CONCURRENCY", DEFAULT_MAX_WORKERS)),
+                        timeout=WEB_SEARCH_TIMEOUT)
+
+# Confidence (calibrated classifier output or keyword overlap ratio) needed to confirm a domain
+DOMAIN_CONFIRM_THRESHOLD = 0.5
+
 def confirm_domain_match(project_keywords: set, domain: str) -> Tuple[bool, float]:
     domain_toks = set(re.findall(r'\b[a-zA-Z]{3,}\b', domain.lower()))
     overlap = len(project_keywords & domain_toks)
     confidence = overlap / max(1, len(domain_toks))
-    confirmed = confidence > 0.5
+    confirmed = confidence > DOMAIN_CONFIRM_THRESHOLD
     return confirmed, confidence
 
-def infer_project_domains(projects: List[str], use_web_search: bool = True) -> Dict[str, Dict[str, any]]:
-    domains_per_project = {}
+def infer_project_domains(projects: List[str], use_web_search: bool = False) -> Dict[str, Dict[str, any]]:
+    projects = [p for p in projects if isinstance(p, str) and p.strip()]
+    web_keywords = {}
+    if use_web_search:
+        queries = {p: f"software domain for project: {p[:100]}" for p in projects}
+        found = WEB_ENRICHER.enrich(queries.values(), top_n=5)
+        web_keywords = {p: found[q] for p, q in queries.items() if q in found}
     
-    for project in projects:
-        if not project.strip():
-            continue
-        
-        project_key = project[:50] + "..."
-        
-        # Local keywords
-        local_keywords = set()
-        doc = nlp(project)
-        for chunk in doc.noun_chunks:
-            if len(chunk.text) > 2:
-                local_keywords.add(chunk.text.lower())
-        for ent in doc.ents:
-            local_keywords.add(ent.text.lower())
-        
-        enriched_keywords = local_keywords.copy()
-        if use_web_search:
-            query = f"software domain for project: {project[:100]}"
-            search_keywords = web_search_extract_keywords(query, top_n=5)
-            enriched_keywords.update(search_keywords)
-        
-        # Match and confirm
-        domain_scores = {}
-        for domain in COMMON_DOMAINS:
-            confirmed, conf = confirm_domain_match(enriched_keywords, domain)
-            if confirmed:
-                domain_scores[domain] = conf
-        
+    classifier = get_domain_classifier()
+    if classifier is not None:
+        # All projects in one vectorised call, limited to this module's domains
+        texts = [" ".join([p, *web_keywords.get(p, ())]) for p in projects]
+        scores_per_project = [dict(m) for m in classifier.predict(texts, min_confidence=DOMAIN_CONFIRM_THRESHOLD,
+                                                                  labels=COMMON_DOMAINS)]
+    else:
+        scores_per_project = overlap_domain_scores(projects, web_keywords)
+    
+    domains_per_project = {}
+    for project, domain_scores in zip(projects, scores_per_project):
         top_domains = [d for d, _ in sorted(domain_scores.items(), key=lambda x: x[1], reverse=True)[:3]]
         overall_confidence = sum(domain_scores.values()) / max(1, len(domain_scores)) if domain_scores else 0.0
         
-        domains_per_project[project_key] = {
+        domains_per_project[project[:50] + "..."] = {
             "domains": top_domains,
             "confirmed": bool(top_domains),
-            "confidence": round(overall_confidence, 2)
+            "confidence": round(overall_confidence, 2),
+            "source": "web" if project in web_keywords else "local",
         }
     
     if not domains_per_project:
@@ -124,6 +168,28 @@ def infer_project_domains(projects: List[str], use_web_search: bool = True) -> D
     
     return domains_per_project
 
+def overlap_domain_scores(projects: List[str], web_keywords: Dict[str, List[str]]) -> List[Dict[str, float]]:
+    # All of this resume's projects go through spaCy in one nlp.pipe run
+    project_keywords = scoring.project_keywords_batch(projects)
+    scores_per_project = []
+    for project in projects:
+        keywords = set(project_keywords.get(project, ()))
+        if get_nlp() is None:
+            keywords.update(scoring.tokenize(project))
+        keywords.update(web_keywords.get(project, ()))
+        
+        domain_scores = {}
+        for domain in COMMON_DOMAINS:
+            confirmed, conf = confirm_domain_match(keywords, domain)
+            if confirmed:
+                domain_scores[domain] = conf
+        scores_per_project.append(domain_scores)
+    return scores_per_project
+
+def refine_project_domains(resume_id: ObjectId, projects: List[str]):
+    project_domains = infer_project_domains(projects, use_web_search=True)
+    resumes_col.update_one({"_id": resume_id}, {"$set": {"project_domains": project_domains}})
+
 def save_domain_keywords(query: str):
     keywords = web_search_extract_keywords(query)
     domain_keywords_col.update_one({"query": query}, {"$set": {"keywords": keywords}}, upsert=True)
@@ -137,9 +203,16 @@ def get_latest_domain_keywords(query: str) -> List[str]:
 
 def tokenize_text(text: str) -> List[str]:
     tokens = scoring.tokenize(text)
-    tokens.extend([s for s in SKILLS_VOCAB if s in text.lower()])
+    low = text.lower()
+    tokens.extend([s for s in get_vocabulary(SKILLS_JSON_PATH).skills if s in low])
     return list(set(tokens))
 
+def persist_upload(file_path: Path, data: bytes):
+    try:
+        file_path.write_bytes(data)
+    except OSError as e:
+        print(f"Could not persist upload {file_path}: {e}")
+
 def score_resume_with_dynamic_keywords(resume: Dict, keywords: List[str]) -> Dict:
     jd_text = " ".join(keywords)
     # Call scoring's score_resume and add domains
@@ -147,19 +220,21 @@ def score_resume_with_dynamic_keywords(resume: Dict, keywords: List[str]) -> Dic
     base_score["project_domains"] = infer_project_domains(resume.get("projects", []))
     return base_score
 
+ARCHIVE_CONTENT_TYPES = ["application/zip", "application/x-zip-compressed"]
+
 @app.post("/upload/")
 async def upload_resume(file: UploadFile = File(...), job_domain_query: str = "", background_tasks: BackgroundTasks = None):
     if file.content_type not in [
         "application/pdf",
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         "text/plain",
+        *ARCHIVE_CONTENT_TYPES,
     ]:
         raise HTTPException(status_code=400, detail="Unsupported file type")
-    file_path = UPLOAD_DIR / file.filename
-    with open(file_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
-
-    parsed_data = parse_file(file_path, SKILLS_JSON_PATH)
+    data = await file.read()
+    file_path = UPLOAD_DIR / Path(file.filename).name
+    if PERSIST_UPLOADS:
+        background_tasks.add_task(persist_upload, file_path, data)
 
     if job_domain_query:
         background_tasks.add_task(save_domain_keywords, job_domain_query)
@@ -167,24 +242,70 @@ async def upload_resume(file: UploadFile = File(...), job_domain_query: str = ""
     else:
         domain_keywords = []
 
-    score_result = score_resume_with_dynamic_keywords(parsed_data, domain_keywords)
+    if file.content_type in ARCHIVE_CONTENT_TYPES or is_archive(file.filename):
+        # One document per resume in the zip; unreadable members are reported, not stored
+        results = []
+        for parsed_data in iter_parse_archive(data, SKILLS_JSON_PATH, archive_name=file.filename,
+                                              cache=PARSE_CACHE, page_workers=PDF_PAGE_WORKERS):
+            if parsed_data.error is not None:
+                results.append({"file": parsed_data.file, "error": parsed_data.error})
+                continue
+            results.append({"file": parsed_data.file,
+                            **store_parsed_resume(parsed_data, file_path, job_domain_query, domain_keywords,
+                                                  background_tasks)})
+        return {"archive": file.filename, "resumes": results}
+
+    try:
+        parsed_data = parse_bytes(data, file.filename, SKILLS_JSON_PATH, cache=PARSE_CACHE,
+                                  page_workers=PDF_PAGE_WORKERS)
+    except DocumentTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except CORRUPT_DOCUMENT_ERRORS as e:
+        raise HTTPException(status_code=400, detail=f"Could not read {file.filename}: {e}")
+    return store_parsed_resume(parsed_data, file_path, job_domain_query, domain_keywords, background_tasks)
+
+def previous_score(resume_id: str, job_domain_query: str) -> Optional[Dict]:
+    if not ObjectId.is_valid(resume_id):
+        return None
+    doc = resumes_col.find_one({"_id": ObjectId(resume_id), "domain_query": job_domain_query})
+    if not doc:
+        return None
+    return {"score": doc.get("score"), "matched": doc.get("matched_keywords"),
+            "missing": doc.get("missing_keywords"), "project_domains": doc.get("project_domains", {})}
+
+def store_parsed_resume(parsed_data, file_path: Path, job_domain_query: str, domain_keywords: List[str],
+                        background_tasks: Optional[BackgroundTasks] = None) -> Dict:
+    resume_id = ObjectId()
+    # duplicate_of is the _id of the stored original
+    get_dedup().observe(parsed_data, key=str(resume_id))
+    score_result = None
+    if parsed_data.duplicate_of:
+        # Skip scoring (and its web searches) when the original was scored for this query
+        score_result = previous_score(parsed_data.duplicate_of, job_domain_query)
+    if score_result is None:
+        score_result = score_resume_with_dynamic_keywords(parsed_data, domain_keywords)
 
     # NEW: Compute project domains (already in score_result)
     project_domains = score_result.get("project_domains", {})
 
     resume_doc = {
-        "filename": file.filename,
-        "filepath": str(file_path),
-        "parsed_data": parsed_data,
+        "_id": resume_id,
+        "filename": parsed_data.file,
+        "filepath": str(file_path) if PERSIST_UPLOADS else None,
+        "parsed_data": offload_raw_text(parsed_data, TEXT_STORE).to_dict(),
         "domain_query": job_domain_query,
         "domain_keywords": domain_keywords,
         "score": score_result.get("score"),
         "matched_keywords": score_result.get("matched"),
         "missing_keywords": score_result.get("missing"),
         "project_domains": project_domains,
+        "duplicate_of": parsed_data.duplicate_of,
     }
     inserted = resumes_col.insert_one(resume_doc)
-    return {"id": str(inserted.inserted_id), "score": score_result.get("score")}
+    if WEB_DOMAIN_REFINEMENT and background_tasks is not None and parsed_data.projects:
+        background_tasks.add_task(refine_project_domains, inserted.inserted_id, parsed_data.projects)
+    return {"id": str(inserted.inserted_id), "score": score_result.get("score"),
+            "duplicate_of": parsed_data.duplicate_of}
 
 @app.get("/resume/{resume_id}")
 def get_resume(resume_id: str):
@@ -198,6 +319,24 @@ def get_resume(resume_id: str):
     resume["_id"] = str(resume["_id"])
     return JSONResponse(content=resume)
 
+@app.get("/resume/{resume_id}/raw_text")
+def get_resume_raw_text(resume_id: str):
+    try:
+        obj_id = ObjectId(resume_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid resume ID")
+    resume = resumes_col.find_one({"_id": obj_id}, {"parsed_data.raw_text": 1, "parsed_data.raw_text_ref": 1})
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    parsed = resume.get("parsed_data", {})
+    # Older documents still carry the text inline
+    text = parsed.get("raw_text")
+    if text is None and parsed.get("raw_text_ref"):
+        text = TEXT_STORE.get(parsed["raw_text_ref"])
+    if text is None:
+        raise HTTPException(status_code=404, detail="Raw text not found")
+    return {"id": resume_id, "raw_text": text}
+
 @app.get("/resumes/")
 def list_resumes():
     resumes = list(resumes_col.find({}, {"filename": 1, "score": 1}))
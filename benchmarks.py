@@ -0,0 +1,251 @@
+"""
+Micro-benchmarks for the parsing and scoring hot paths.
+
+Run one benchmark by name, e.g.:
+    python benchmarks.py skills
+
+The spacy benchmark loads en_core_web_sm unless BENCH_SPACY_MODEL names
+another installed package or a pipeline directory.
+"""
+import os
+import re
+import random
+import string
+import sys
+import time
+from typing import Callable, List, Tuple
+
+import parser as resume_parser
+
+
+def _timeit(fn: Callable, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _random_words(rng: random.Random, n: int) -> List[str]:
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(n)]
+
+
+# -----------------------------
+# Skill matching vs vocabulary size
+# -----------------------------
+def _legacy_extract_skills(text: str, skills_list: List[str]) -> set:
+    found = set()
+    low = text.lower()
+    for skill in skills_list:
+        if re.search(rf"(?<![a-z0-9]){re.escape(skill.lower())}(?![a-z0-9])", low):
+            found.add(skill.title())
+    return found
+
+
+def bench_skills(sizes=(100, 500, 2000, 5000), text_words: int = 1500) -> None:
+    rng = random.Random(0)
+    base = resume_parser.load_skills_dict(resume_parser.Path("skills.json"))
+    print(f"{'vocab':>6} {'legacy ms':>10} {'matcher ms':>11} {'speedup':>8} {'MB/s':>8}")
+    for size in sizes:
+        vocab = list(base) + [" ".join(_random_words(rng, rng.randint(1, 3))) for _ in range(max(0, size - len(base)))]
+        vocab = vocab[:size]
+        text = " ".join(rng.choice(vocab) if rng.random() < 0.1 else w
+                        for w in _random_words(rng, text_words))
+        matcher = resume_parser.SkillMatcher(vocab)
+        assert matcher.find(text.lower()) == _legacy_extract_skills(text, vocab)
+
+        legacy = _timeit(lambda: _legacy_extract_skills(text, vocab), repeat=3)
+        fast = _timeit(lambda: matcher.find(text.lower()))
+        mbps = len(text) / fast / 1e6
+        print(f"{size:>6} {legacy * 1e3:>10.2f} {fast * 1e3:>11.2f} {legacy / fast:>7.1f}x {mbps:>8.1f}")
+
+
+# -----------------------------
+# Project extraction on pathological layouts
+# -----------------------------
+def _legacy_extract_projects(text: str) -> Tuple[List[str], float]:
+    projects = []
+
+    sec = re.search(
+        r"(?si)(projects?|project details)\s*[:\-]?\s*(.+?)(\n[A-Z][A-Za-z ]{3,}|$)",
+        text
+    )
+    if sec:
+        block = sec.group(2)
+        lines = [l.strip() for l in block.split("\n") if len(l.strip()) > 2]
+
+        combined = []
+        current_title = ""
+
+        for line in lines:
+            if line.isupper():
+                continue
+
+            if re.match(r"^[A-Za-z].{4,}", line) and not line.startswith(("•", "-", "*", "• ", "1.", "2.")):
+                current_title = line
+                combined.append([line])
+                continue
+
+            if current_title and (line.startswith(("•", "-", "*")) or len(line.split()) > 3):
+                combined[-1].append(line)
+
+        for c in combined:
+            title = c[0]
+            desc = "; ".join([d.lstrip("•-* ") for d in c[1:]])
+            if desc:
+                projects.append(f"{title} – {desc}")
+            else:
+                projects.append(title)
+
+    numbered = re.findall(r"(?m)^\s*(\d+\.|\(\d+\))\s*(.+)", text)
+    for _, title in numbered:
+        title = title.strip()
+        pattern = rf"{re.escape(title)}\s*\n(.+?)(\n\d+\.|\n[A-Z ]{{3,}}|$)"
+        desc = re.search(pattern, text, re.S)
+        if desc:
+            block = desc.group(1).strip()
+            block = re.sub(r"\n{1,2}", " ", block)
+            projects.append(f"{title} – {block}")
+        else:
+            projects.append(title)
+
+    bullets = re.findall(r"(?m)^\s*[-•*]\s*(.+)", text)
+    for b in bullets:
+        if len(b) > 5:
+            projects.append(b.strip())
+
+    final = []
+    for p in projects:
+        p = p.strip(" .-_")
+        if len(p) > 5 and p not in final:
+            final.append(p)
+
+    return final[:10], (0.9 if final else 0.0)
+
+
+def _numbered_resume(n_items: int) -> str:
+    lines = ["PROJECTS"]
+    for i in range(1, n_items + 1):
+        lines.append(f"{i}. Project number {i} built with python")
+        lines.append(f"worked on module {i} and its tests")
+    return "\n".join(lines)
+
+
+def bench_projects(sizes=(50, 100, 250, 500)) -> None:
+    # "all items" walks every candidate, without the early stop at
+    # MAX_PROJECTS, to show the per-item cost stays flat.
+    print(f"{'items':>6} {'legacy ms':>10} {'new ms':>8} {'all items ms':>13} {'speedup':>8}")
+    for n in sizes:
+        text = _numbered_resume(n)
+        assert resume_parser.extract_projects(text) == _legacy_extract_projects(text)
+        legacy = _timeit(lambda: _legacy_extract_projects(text), repeat=3)
+        fast = _timeit(lambda: resume_parser.extract_projects(text))
+        full = _timeit(lambda: list(resume_parser._iter_project_candidates(text)))
+        print(f"{n:>6} {legacy * 1e3:>10.2f} {fast * 1e3:>8.3f} {full * 1e3:>13.3f} {legacy / fast:>7.1f}x")
+
+
+# -----------------------------
+# Text normalisation and duplicate-word removal
+# -----------------------------
+def _legacy_clean_text(text: str) -> str:
+    text = text.replace("\x00", " ")
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\r", "\n", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+def _legacy_is_kannada(text: str) -> bool:
+    return bool(re.search(r"[\u0C80-\u0CFF]", text))
+
+
+def _legacy_remove_duplicate_words(text: str) -> str:
+    words = text.split()
+    seen = []
+    out = []
+    for w in words:
+        lw = w.lower()
+        if lw not in seen:
+            seen.append(lw)
+            out.append(w)
+    return " ".join(out)
+
+
+def _messy_text(rng: random.Random, n_words: int) -> str:
+    seps = [" ", "  ", "\t", "\n", "\r\n", "\n\n\n\n", " \x00 "]
+    return "".join(w + rng.choice(seps) for w in _random_words(rng, n_words))
+
+
+def bench_normalize(sizes=(1_000, 10_000, 50_000)) -> None:
+    rng = random.Random(0)
+    print(f"{'words':>7} {'clean legacy ms':>16} {'normalize ms':>13} {'dedupe legacy ms':>17} {'dedupe ms':>10}")
+    for n in sizes:
+        text = _messy_text(rng, n)
+        assert resume_parser.normalize_text(text) == (_legacy_clean_text(text), _legacy_is_kannada(text))
+        # one long "project description" of mostly unique words
+        line = " ".join(_random_words(rng, n // 10))
+        assert resume_parser.remove_duplicate_words(line) == _legacy_remove_duplicate_words(line)
+
+        legacy = _timeit(lambda: (_legacy_clean_text(text), _legacy_is_kannada(text)))
+        fast = _timeit(lambda: resume_parser.normalize_text(text))
+        dedupe_legacy = _timeit(lambda: _legacy_remove_duplicate_words(line), repeat=3)
+        dedupe = _timeit(lambda: resume_parser.remove_duplicate_words(line))
+        print(f"{n:>7} {legacy * 1e3:>16.2f} {fast * 1e3:>13.2f} {dedupe_legacy * 1e3:>17.2f} {dedupe * 1e3:>10.3f}")
+
+
+# -----------------------------
+# spaCy startup and memory: two full loads vs the shared trimmed pipeline
+# -----------------------------
+_SPACY_PROBE = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+model = sys.argv[2]
+if sys.argv[1] == "legacy":
+    import spacy
+    # what importing scoring.py and backend.py used to do
+    models = [spacy.load(model), spacy.load(model)]
+else:
+    from nlp_models import get_nlp
+    models = [get_nlp(model), get_nlp(model)]
+elapsed = time.perf_counter() - t0
+doc = models[0]("Built a resume parser with spaCy and FastAPI for Google recruiters")
+print(json.dumps({"secs": elapsed, "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                  "chunks": [c.text for c in doc.noun_chunks], "ents": [e.text for e in doc.ents]}))
+"""
+
+
+def bench_spacy(runs: int = 3, model: str = None) -> None:
+    # Each variant runs in a fresh interpreter so load time and peak RSS are
+    # not shared; the noun chunks and entities must match between them.
+    import json
+    import subprocess
+    model = model or os.environ.get("BENCH_SPACY_MODEL", "en_core_web_sm")
+    print(f"model: {model}")
+    results = {}
+    for variant in ("legacy", "shared"):
+        results[variant] = [
+            json.loads(subprocess.run([sys.executable, "-c", _SPACY_PROBE, variant, model], capture_output=True,
+                                      text=True, check=True).stdout.strip().splitlines()[-1])
+            for _ in range(runs)
+        ]
+    legacy, shared = results["legacy"][0], results["shared"][0]
+    assert (legacy["chunks"], legacy["ents"]) == (shared["chunks"], shared["ents"])
+    print(f"{'variant':>8} {'load s':>8} {'peak RSS MB':>12}")
+    for variant, samples in results.items():
+        print(f"{variant:>8} {min(s['secs'] for s in samples):>8.2f} {min(s['rss_mb'] for s in samples):>12.0f}")
+
+
+BENCHMARKS = {
+    "skills": bench_skills,
+    "projects": bench_projects,
+    "normalize": bench_normalize,
+    "spacy": bench_spacy,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"== {name} ==")
+        BENCHMARKS[name]()
@@ -0,0 +1,141 @@
+"""
+Parquet/Arrow output for bulk parsing.
+
+Records are written in row groups with a fixed, typed schema (list<string>
+skills and projects, a contacts struct, map<string, int32> confidences)
+instead of object-dtype pandas columns, so a large corpus can be memory
+mapped and read a few columns at a time:
+
+    table = read_table("resumes.parquet", columns=["file", "skills"])
+
+pyarrow is optional; only this module needs it.
+"""
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+import pandas as pd
+
+from records import FIELD_NAMES, ParsedResume
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+
+def _require_arrow() -> None:
+    if pa is None:
+        raise ImportError("pyarrow is required for Parquet output. Install with: pip install pyarrow")
+
+
+def resume_schema():
+    _require_arrow()
+    text_list = pa.list_(pa.string())
+    return pa.schema([
+        ("file", pa.string()),
+        ("name", pa.string()),
+        ("contacts", pa.struct([(k, pa.string()) for k in ("phone", "email", "linkedin", "github")])),
+        ("skills", text_list),
+        ("cgpa", pa.string()),
+        ("projects", text_list),
+        ("projects_text", pa.string()),
+        ("experience", pa.list_(pa.struct([
+            ("title", pa.string()), ("company", pa.string()),
+            ("duration", pa.string()), ("bullets", text_list),
+        ]))),
+        ("confidence", pa.map_(pa.string(), pa.int32())),
+        ("language", pa.string()),
+        ("minhash", pa.string()),
+        ("duplicate_of", pa.string()),
+        ("raw_text", pa.string()),
+        ("raw_text_ref", pa.string()),
+        ("error", pa.string()),
+        ("timings", pa.map_(pa.string(), pa.float64())),
+    ])
+
+
+def records_to_batch(records: List[ParsedResume], schema=None):
+    """One Arrow RecordBatch from a list of records; fields a record lacks are null."""
+    schema = schema or resume_schema()
+    arrays = []
+    for field in schema:
+        values = [getattr(r, field.name) if field.name in FIELD_NAMES else None for r in records]
+        if pa.types.is_map(field.type):
+            values = [list(v.items()) if v is not None else None for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class ParquetRecordWriter:
+    """
+    Streams records to a Parquet file, buffering batch_size records per row
+    group. Use as a context manager or call close().
+    """
+
+    def __init__(self, path: Union[str, Path], batch_size: int = 1000,
+                 compression: str = "zstd", schema=None):
+        _require_arrow()
+        self.path = Path(path)
+        self.batch_size = max(1, batch_size)
+        self.schema = schema or resume_schema()
+        self._writer = pq.ParquetWriter(str(self.path), self.schema, compression=compression)
+        self._pending: List[ParsedResume] = []
+        self.rows = 0
+
+    def write(self, record: ParsedResume) -> None:
+        self._pending.append(record)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records: Iterable[ParsedResume]) -> None:
+        for record in records:
+            self.write(record)
+
+    def flush(self) -> None:
+        if self._pending:
+            self._writer.write_batch(records_to_batch(self._pending, self.schema))
+            self.rows += len(self._pending)
+            self._pending = []
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.close()
+
+    def __enter__(self) -> "ParquetRecordWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def write_parquet(records: Iterable[ParsedResume], path: Union[str, Path],
+                  batch_size: int = 1000, compression: str = "zstd") -> int:
+    """Write any iterable of records (e.g. parser.iter_parse_folder) and return the row count."""
+    with ParquetRecordWriter(path, batch_size=batch_size, compression=compression) as writer:
+        writer.write_many(records)
+    return writer.rows
+
+
+def read_table(path: Union[str, Path], columns: Optional[List[str]] = None):
+    """Memory-mapped read of just the requested columns."""
+    _require_arrow()
+    return pq.read_table(str(path), columns=columns, memory_map=True)
+
+
+def read_frame(path: Union[str, Path], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Same columns as a DataFrame: list columns come back as Python lists and
+    map columns as dicts, matching parser.parse_folder output.
+    """
+    table = read_table(path, columns)
+    df = table.to_pandas(maps_as_pydicts="strict")
+    for field in table.schema:
+        if pa.types.is_list(field.type):
+            df[field.name] = [v.tolist() if v is not None else None for v in df[field.name]]
+        elif pa.types.is_struct(field.type):
+            # contacts only carry the keys that were found
+            df[field.name] = [{k: x for k, x in v.items() if x is not None} if v is not None else None
+                              for v in df[field.name]]
+    # Fields no record populated are not columns in parse_folder output either
+    return df[[c for c in df.columns if table.column(c).null_count < len(table)]]
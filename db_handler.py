@@ -4,9 +4,11 @@ MongoDB handler for resume parser - saves parsed resumes to database
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Union
 import pandas as pd
 from bson import ObjectId
+from records import ParsedResume
+from text_store import MongoTextStore
 
 class ResumeDB:
     def __init__(self, mongo_uri: str = "mongodb://localhost:27017", db_name: str = "resume_db"):
@@ -18,6 +20,8 @@ class ResumeDB:
             self.db = self.client[db_name]
             self.resumes_col = self.db['resumes']
             self.scoring_col = self.db['scoring_history']
+            # raw_text lives here, referenced from resumes by raw_text_ref
+            self.text_store = MongoTextStore(self.db['resume_text'])
             print(f"✓ Connected to MongoDB: {db_name}")
         except ConnectionFailure as e:
             print(f"✗ MongoDB connection failed: {e}")
@@ -25,21 +29,28 @@ class ResumeDB:
             self.db = None
             self.resumes_col = None
             self.scoring_col = None
+            self.text_store = None
     
     def is_connected(self) -> bool:
         """Check if MongoDB is connected"""
         return self.client is not None and self.db is not None
     
-    def save_resume(self, resume_data: Dict) -> Optional[str]:
+    def save_resume(self, resume_data: Union[Dict, ParsedResume], text_source=None) -> Optional[str]:
         """
-        Save a single parsed resume to MongoDB
+        Save a single parsed resume to MongoDB. Inline raw_text is moved to
+        the resume_text collection; a raw_text_ref that only exists in another
+        store (text_source, e.g. the app's FileTextStore) is copied over.
         Returns: ObjectId as string if successful, None otherwise
         """
         if not self.is_connected():
             print("⚠️ MongoDB not connected. Cannot save resume.")
             return None
+        if isinstance(resume_data, ParsedResume):
+            resume_data = resume_data.to_dict()
         
         try:
+            self._store_raw_text(resume_data, text_source)
+
             # Add timestamp
             resume_data['uploaded_at'] = datetime.utcnow()
             resume_data['last_updated'] = datetime.utcnow()
@@ -65,7 +76,23 @@ class ResumeDB:
             print(f"✗ Error saving resume: {e}")
             return None
     
-    def save_resumes_batch(self, df: pd.DataFrame) -> List[str]:
+    def _store_raw_text(self, resume_data: Dict, text_source=None) -> None:
+        text = resume_data.pop("raw_text", None)
+        if isinstance(text, str):
+            resume_data["raw_text_ref"] = self.text_store.put(text)
+            return
+        ref = resume_data.get("raw_text_ref")
+        if text_source is not None and isinstance(ref, str) and not self.text_store.has(ref):
+            text = text_source.get(ref)
+            if text is not None:
+                self.text_store.put(text)
+
+    def get_raw_text(self, ref: str) -> Optional[str]:
+        if not self.is_connected():
+            return None
+        return self.text_store.get(ref)
+
+    def save_resumes_batch(self, df: pd.DataFrame, text_source=None) -> List[str]:
         """
         Save multiple resumes from DataFrame to MongoDB
         Returns: List of ObjectId strings
@@ -77,7 +104,25 @@ class ResumeDB:
         saved_ids = []
         for _, row in df.iterrows():
             resume_dict = row.to_dict()
-            resume_id = self.save_resume(resume_dict)
+            resume_id = self.save_resume(resume_dict, text_source)
+            if resume_id:
+                saved_ids.append(resume_id)
+        
+        return saved_ids
+    
+    def save_resumes_stream(self, records: Iterable[Union[Dict, ParsedResume]]) -> List[str]:
+        """
+        Save parsed resumes from any iterable (e.g. parser.iter_parse_folder)
+        without materialising them as a DataFrame first
+        Returns: List of ObjectId strings
+        """
+        if not self.is_connected():
+            print("⚠️ MongoDB not connected. Cannot save resumes.")
+            return []
+        
+        saved_ids = []
+        for record in records:
+            resume_id = self.save_resume(record.to_dict() if isinstance(record, ParsedResume) else dict(record))
             if resume_id:
                 saved_ids.append(resume_id)
         
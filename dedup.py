@@ -0,0 +1,177 @@
+"""
+Near-duplicate resume detection with MinHash signatures and an LSH index.
+
+The parser computes a signature from each resume's normalised text (word
+3-shingles, NUM_PERM permutations, the same hashing scheme as datasketch).
+A DuplicateDetector keeps the signatures seen so far in LSH band tables,
+so checking a new resume only compares it against the few candidates that
+share a band, then confirms with the estimated Jaccard similarity.
+"""
+import re
+import zlib
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+
+from records import ParsedResume
+
+NUM_PERM = 128
+SHINGLE_WORDS = 3
+DEFAULT_THRESHOLD = 0.9
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD_RE = re.compile(r"\w+")
+
+
+# -----------------------------
+# Signatures
+# -----------------------------
+@lru_cache(maxsize=4)
+def _permutations(num_perm: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Fixed seed: signatures must compare across processes and restarts
+    gen = np.random.RandomState(1)
+    a = gen.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    b = gen.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash(text: str, num_perm: int = NUM_PERM) -> Optional[np.ndarray]:
+    """uint32 MinHash signature of the text's word shingles; None for empty text."""
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return None
+    k = min(SHINGLE_WORDS, len(words))
+    grams = {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+    # crc32 is stable across processes, unlike hash()
+    hv = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+    a, b = _permutations(num_perm)
+    phv = (hv[:, None] * a + b) % _MERSENNE_PRIME & _MAX_HASH
+    return phv.min(axis=0).astype(np.uint32)
+
+
+def signature_hex(signature: np.ndarray) -> str:
+    return signature.astype("<u4").tobytes().hex()
+
+
+def signature_from_hex(value: str) -> np.ndarray:
+    return np.frombuffer(bytes.fromhex(value), dtype="<u4")
+
+
+def estimate_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+# -----------------------------
+# LSH index
+# -----------------------------
+@lru_cache(maxsize=16)
+def _optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """(bands, rows) minimising false positives + false negatives around threshold."""
+    below = np.linspace(0.0, threshold, 200)
+    above = np.linspace(threshold, 1.0, 200)
+    best, best_err = (1, num_perm), float("inf")
+    for b in range(1, num_perm + 1):
+        for r in range(1, num_perm // b + 1):
+            fp = (1 - (1 - below ** r) ** b).mean() * threshold
+            fn = ((1 - above ** r) ** b).mean() * (1 - threshold)
+            if fp + fn < best_err:
+                best, best_err = (b, r), fp + fn
+    return best
+
+
+class LSHIndex:
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = NUM_PERM):
+        self.num_perm = num_perm
+        self.bands, self.rows = _optimal_bands(threshold, num_perm)
+        self._tables = [defaultdict(set) for _ in range(self.bands)]
+        self._keys: Dict[str, list] = {}
+
+    def _band_keys(self, signature: np.ndarray) -> list:
+        r = self.rows
+        return [signature[i * r:(i + 1) * r].tobytes() for i in range(self.bands)]
+
+    def insert(self, key: str, signature: np.ndarray) -> None:
+        if key in self._keys:
+            self.remove(key)
+        bands = self._band_keys(signature)
+        for table, band in zip(self._tables, bands):
+            table[band].add(key)
+        self._keys[key] = bands
+
+    def remove(self, key: str) -> None:
+        for table, band in zip(self._tables, self._keys.pop(key, [])):
+            bucket = table.get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del table[band]
+
+    def query(self, signature: np.ndarray) -> Set[str]:
+        found = set()
+        for table, band in zip(self._tables, self._band_keys(signature)):
+            found.update(table.get(band, ()))
+        return found
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+# -----------------------------
+# Detector used at ingest
+# -----------------------------
+class DuplicateDetector:
+    """
+    Remembers resume signatures by key: the file name when it is passed to
+    the parser as dedup=..., or any caller-chosen id given to observe(). A
+    near-duplicate of a known resume is still parsed in full (two people
+    can share a template) and only flagged with duplicate_of; callers may
+    reuse the original's score. Only signatures are held, never records.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = NUM_PERM):
+        self.threshold = threshold
+        self.index = LSHIndex(threshold, num_perm)
+        self._signatures: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, key: str, signature: np.ndarray) -> None:
+        self.index.insert(key, signature)
+        self._signatures[key] = signature
+
+    def add_hex(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Seed from stored (file, minhash hex) pairs, e.g. a DataFrame or Mongo."""
+        for key, value in items:
+            if isinstance(value, str) and value:
+                self.add(key, signature_from_hex(value))
+
+    def find(self, signature: np.ndarray, exclude: Optional[str] = None) -> Optional[str]:
+        """The most similar known resume at or above the threshold, if any."""
+        best, best_sim = None, self.threshold
+        for key in self.index.query(signature):
+            if key == exclude:
+                continue
+            sim = estimate_jaccard(signature, self._signatures[key])
+            if sim >= best_sim:
+                best, best_sim = key, sim
+        return best
+
+    def observe(self, record: ParsedResume, key: Optional[str] = None) -> ParsedResume:
+        """Flag (or register, under key or else record.file) an already parsed record."""
+        if record.error is not None or not record.minhash or record.duplicate_of:
+            return record
+        key = key or record.file
+        signature = signature_from_hex(record.minhash)
+        original = self.find(signature, exclude=key)
+        if original is not None:
+            record.duplicate_of = original
+        else:
+            self.add(key, signature)
+        return record
@@ -0,0 +1,131 @@
+"""
+Streaming text extraction for .docx files.
+
+Reads the main document part (and the page headers) straight out of the zip
+with iterparse instead of building a python-docx Document, so memory stays
+flat on large templated files. Unlike Document.paragraphs it also returns
+text from tables, text boxes and headers, one paragraph per line: the body
+in document order, then the header lines.
+"""
+import re
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+from xml.etree.ElementTree import ParseError, iterparse
+
+_W_NAMESPACES = (
+    "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
+    "http://purl.oclc.org/ooxml/wordprocessingml/main",  # ISO strict
+)
+
+def _tags(*names: str) -> frozenset:
+    return frozenset(f"{{{ns}}}{name}" for ns in _W_NAMESPACES for name in names)
+
+_P = _tags("p")
+_PPR = _tags("pPr")
+_TEXT = _tags("t")
+_TAB = _tags("tab", "ptab")
+_BREAK = _tags("br", "cr")
+_HYPHEN = _tags("noBreakHyphen")
+# mc:Fallback repeats the mc:Choice content (e.g. a VML copy of a text box)
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+_OFFICE_DOCUMENT_REL = re.compile(r'Type="[^"]*/officeDocument"[^>]*Target="/?([^"]+)"'
+                                  r'|Target="/?([^"]+)"[^>]*Type="[^"]*/officeDocument"')
+_HEADER_PART = re.compile(r"word/header(\d*)\.xml")
+
+DocxSource = Union[str, Path, BinaryIO]
+
+
+def docx_text(source: DocxSource, max_chars: Optional[int] = None) -> str:
+    """
+    Join the paragraphs of a .docx (path or binary file-like object) with
+    newlines. Stops reading once max_chars is exceeded. Anything that is not
+    a readable .docx raises zipfile.BadZipFile.
+    """
+    parts = []
+    total = 0
+    with zipfile.ZipFile(source) as zf:
+        try:
+            for line in iter_docx_lines(zf):
+                parts.append(line)
+                total += len(line) + 1
+                if max_chars is not None and total > max_chars:
+                    break
+        except (KeyError, ParseError) as e:
+            # A missing part or malformed XML: a zip, but not a usable .docx
+            raise zipfile.BadZipFile(f"not a valid .docx: {e}") from e
+    return "\n".join(parts)
+
+
+def iter_docx_lines(zf: zipfile.ZipFile) -> Iterator[str]:
+    # document -> body -> blocks
+    yield from _iter_part(zf, _main_part(zf), container_depth=2)
+    # Headers last, so their text ("Curriculum Vitae", a running title) never
+    # comes before the body's name line. The first-page/default/even variants
+    # usually repeat each other.
+    seen = set()
+    headers = [(m.group(1), name) for name in zf.namelist() for m in [_HEADER_PART.fullmatch(name)] if m]
+    for _, part in sorted(headers, key=lambda h: int(h[0] or 0)):
+        for line in _iter_part(zf, part, container_depth=1):
+            if line.strip() and line not in seen:
+                seen.add(line)
+                yield line
+
+
+def _main_part(zf: zipfile.ZipFile) -> str:
+    try:
+        rels = zf.read("_rels/.rels").decode("utf-8", errors="ignore")
+    except KeyError:
+        return "word/document.xml"
+    m = _OFFICE_DOCUMENT_REL.search(rels)
+    return (m.group(1) or m.group(2)) if m else "word/document.xml"
+
+
+def _iter_part(zf: zipfile.ZipFile, part: str, container_depth: int) -> Iterator[str]:
+    """
+    Yield the text of every w:p in one XML part. Paragraphs nested inside a
+    text box are yielded before the paragraph that anchors it.
+    """
+    open_elems = []
+    paragraphs = []  # text buffers of the open w:p elements
+    in_ppr = 0       # w:tab inside paragraph properties is a tab stop, not text
+    fallback = 0
+    with zf.open(part) as f:
+        for event, elem in iterparse(f, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                open_elems.append(elem)
+                if tag == _MC_FALLBACK:
+                    fallback += 1
+                elif fallback:
+                    pass
+                elif tag in _P:
+                    paragraphs.append([])
+                elif tag in _PPR:
+                    in_ppr += 1
+                continue
+
+            open_elems.pop()
+            if tag == _MC_FALLBACK:
+                fallback -= 1
+            elif fallback or not paragraphs:
+                pass
+            elif tag in _TEXT:
+                paragraphs[-1].append(elem.text or "")
+            elif tag in _PPR:
+                in_ppr -= 1
+            elif in_ppr:
+                pass
+            elif tag in _TAB:
+                paragraphs[-1].append("\t")
+            elif tag in _BREAK:
+                paragraphs[-1].append("\n")
+            elif tag in _HYPHEN:
+                paragraphs[-1].append("-")
+            elif tag in _P:
+                yield "".join(paragraphs.pop())
+
+            # Drop finished blocks so the tree never holds more than one.
+            if len(open_elems) == container_depth:
+                open_elems[-1].clear()
@@ -0,0 +1,145 @@
+"""
+Offline project domain classifier.
+
+A TF-IDF model is fitted on the labelled keyword corpus bundled in
+domain_corpus.json (a few example descriptions per domain). Each domain is
+represented by the centroid of its examples, and a project is scored against
+every centroid at once by cosine similarity, so a whole batch of projects is
+one sparse matrix product and no network or spaCy is involved.
+
+Raw similarities are small and bunched together, so predict() reports a
+calibrated confidence in [0, 1] instead: the fraction of (example, domain)
+pairs at that similarity, with each example held out of its own centroid,
+where the domain was the example's own (isotonic fit over the corpus).
+
+    classifier = get_domain_classifier()
+    classifier.predict(["Crop prediction with scikit-learn", ...])
+
+scikit-learn is optional here; get_domain_classifier() returns None without
+it and callers fall back to keyword overlap.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.isotonic import IsotonicRegression
+    from sklearn.preprocessing import normalize
+except ImportError:
+    TfidfVectorizer = IsotonicRegression = normalize = None
+
+DOMAIN_CORPUS_PATH = Path(os.path.dirname(os.path.abspath(__file__))) / "domain_corpus.json"
+
+# Calibrated confidence a domain needs before it is reported for a project
+MIN_CONFIDENCE = 0.3
+TOP_K = 3
+
+# Keeps c++, c#, node.js and ci/cd as single tokens
+_TOKEN_PATTERN = r"[a-z0-9][a-z0-9+#]*(?:[./][a-z0-9]+)*[+#]*"
+
+
+class DomainClassifier:
+    """Nearest-centroid classifier over TF-IDF vectors of the corpus examples."""
+
+    def __init__(self, corpus: Dict[str, List[str]]):
+        self.labels = list(corpus)
+        examples = [e for label in self.labels for e in [label, *corpus[label]]]
+        owners = np.array([i for i, label in enumerate(self.labels) for _ in range(1 + len(corpus[label]))])
+        self.vectorizer = TfidfVectorizer(lowercase=True, token_pattern=_TOKEN_PATTERN,
+                                          ngram_range=(1, 2), sublinear_tf=True, stop_words="english")
+        X = self.vectorizer.fit_transform(examples)
+        sums = np.vstack([np.asarray(X[owners == i].sum(axis=0)) for i in range(len(self.labels))])
+        # Unit-length rows: a dot product with a (unit) TF-IDF vector is the cosine
+        self.centroids = normalize(sums)
+        self._index = {label: i for i, label in enumerate(self.labels)}
+        self._calibration = self._calibrate(X.toarray(), sums, owners)
+
+    def _calibrate(self, X: np.ndarray, sums: np.ndarray, owners: np.ndarray):
+        sims = X @ self.centroids.T
+        # Hold each example out of its own centroid so its similarity is not inflated
+        rows = np.arange(len(owners))
+        held_out = normalize(sums[owners] - X)
+        sims[rows, owners] = np.einsum("ij,ij->i", X, held_out)
+        correct = np.zeros_like(sims)
+        correct[rows, owners] = 1.0
+        return IsotonicRegression(y_min=0.0, y_max=1.0, increasing=True,
+                                  out_of_bounds="clip").fit(sims.ravel(), correct.ravel())
+
+    def confidence(self, similarities: np.ndarray) -> np.ndarray:
+        """Calibrated confidence in [0, 1] for raw cosine similarities (any shape)."""
+        sims = np.asarray(similarities, dtype=float)
+        return self._calibration.predict(sims.ravel()).reshape(sims.shape)
+
+    def similarities(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), len(labels)) cosine similarities, computed in one product."""
+        if not texts:
+            return np.zeros((0, len(self.labels)))
+        return np.asarray(self.vectorizer.transform(texts) @ self.centroids.T)
+
+    def predict(self, texts: Sequence[str], top_k: int = TOP_K, min_confidence: float = MIN_CONFIDENCE,
+                labels: Optional[Iterable[str]] = None) -> List[List[Tuple[str, float]]]:
+        """
+        Best (domain, confidence) pairs per text, highest first, keeping
+        those above min_confidence. labels restricts the answer to a subset
+        of the corpus domains.
+        """
+        sims = self.similarities(list(texts))
+        columns = np.arange(len(self.labels))
+        if labels is not None:
+            columns = np.array([self._index[l] for l in labels if l in self._index], dtype=int)
+        sims = sims[:, columns]
+        conf = self.confidence(sims)
+        results = []
+        for sim_row, conf_row in zip(sims, conf):
+            order = np.argsort(-sim_row, kind="stable")[:top_k]
+            results.append([(self.labels[columns[j]], float(conf_row[j])) for j in order
+                            if conf_row[j] > min_confidence])
+        return results
+
+
+def load_corpus(path: Path = DOMAIN_CORPUS_PATH) -> Dict[str, List[str]]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {label: list(examples) for label, examples in data.get("domains", {}).items()}
+
+
+_LOCK = threading.Lock()
+_CLASSIFIERS: Dict[str, DomainClassifier] = {}
+_UNAVAILABLE = set()
+
+
+def get_domain_classifier(path: Path = DOMAIN_CORPUS_PATH) -> Optional[DomainClassifier]:
+    """The process-wide classifier for a corpus file, fitted on first use; None if unavailable."""
+    key = os.path.abspath(path)
+    classifier = _CLASSIFIERS.get(key)
+    if classifier is not None or key in _UNAVAILABLE:
+        return classifier
+    with _LOCK:
+        if key in _CLASSIFIERS or key in _UNAVAILABLE:
+            return _CLASSIFIERS.get(key)
+        classifier = _fit(key)
+        if classifier is None:
+            _UNAVAILABLE.add(key)
+        else:
+            _CLASSIFIERS[key] = classifier
+    return classifier
+
+
+def _fit(path: str) -> Optional[DomainClassifier]:
+    if TfidfVectorizer is None:
+        print("Warning: scikit-learn is not installed. Install with: pip install scikit-learn")
+        return None
+    try:
+        corpus = load_corpus(Path(path))
+    except (OSError, ValueError) as e:
+        print(f"Warning: could not load domain corpus {path}: {e}")
+        return None
+    if not corpus:
+        print(f"Warning: domain corpus {path} has no domains")
+        return None
+    return DomainClassifier(corpus)
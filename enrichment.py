@@ -0,0 +1,107 @@
+"""
+Concurrent web enrichment for project domain inference.
+
+An Enricher runs a batch of keyword searches on a shared thread pool
+instead of one after another:
+
+    enricher = Enricher(web_search_extract_keywords, max_workers=4, timeout=15)
+    keywords = enricher.enrich(queries, top_n=5)   # {query: [keywords]}
+
+- at most max_workers searches run at once, across all callers;
+- identical queries (same normalised text and top_n) that are already in
+  flight are joined instead of searched again, within a batch and across
+  concurrent batches;
+- each enrich() call waits at most `timeout` seconds. Queries that fail or
+  miss the deadline are left out of the result. A search that is already
+  running finishes in the background (and fills the search cache, if
+  search_fn is cached); one still queued when no caller is waiting for it
+  any more is cancelled, so nothing piles up behind a deadline and the
+  process never waits on a backlog of searches at exit.
+
+search_fn is any fn(query, top_n) -> List[str], e.g. a local stub offline.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from search_cache import normalize_query
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_TIMEOUT = 15.0  # seconds per enrich() call
+
+
+class Enricher:
+    def __init__(self, search_fn: Callable[[str, int], List[str]],
+                 max_workers: int = DEFAULT_MAX_WORKERS, timeout: float = DEFAULT_TIMEOUT):
+        self.search_fn = search_fn
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # key -> [future, callers still waiting for it]
+        self._in_flight: Dict[Tuple[str, int], list] = {}
+        # Re-entrant: cancelling a future runs its done callback in this thread
+        self._lock = threading.RLock()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="web-enrich")
+        return self._pool
+
+    def _acquire(self, query: str, top_n: int) -> Tuple[Tuple[str, int], Future]:
+        """The future for a query, shared with any identical search still in flight."""
+        key = (normalize_query(query), top_n)
+        with self._lock:
+            entry = self._in_flight.get(key)
+            if entry is not None:
+                entry[1] += 1
+                return key, entry[0]
+            future = self._executor().submit(self.search_fn, query, top_n)
+            self._in_flight[key] = [future, 1]
+            future.add_done_callback(lambda f: self._forget(key, f))
+        return key, future
+
+    def _release(self, key: Tuple[str, int], future: Future) -> None:
+        with self._lock:
+            entry = self._in_flight.get(key)
+            if entry is None or entry[0] is not future:
+                return
+            entry[1] -= 1
+            if entry[1] == 0:
+                # Only succeeds for searches that have not started yet
+                future.cancel()
+
+    def _forget(self, key: Tuple[str, int], future: Future) -> None:
+        with self._lock:
+            entry = self._in_flight.get(key)
+            if entry is not None and entry[0] is future:
+                del self._in_flight[key]
+
+    def enrich(self, queries: Iterable[str], top_n: int = 3,
+               timeout: Optional[float] = None) -> Dict[str, List[str]]:
+        """{query: keywords} for the queries whose search finished in time."""
+        acquired = {q: self._acquire(q, top_n) for q in dict.fromkeys(queries)}
+        if not acquired:
+            return {}
+        futures = {q: future for q, (_, future) in acquired.items()}
+        deadline = self.timeout if timeout is None else timeout
+        done, pending = wait(set(futures.values()), timeout=deadline)
+        for key, future in acquired.values():
+            self._release(key, future)
+        if pending:
+            print(f"Web enrichment: {len(pending)} of {len(done) + len(pending)} searches "
+                  f"missed the {deadline:g}s deadline")
+        results = {}
+        for query, future in futures.items():
+            if future not in done:
+                continue
+            try:
+                results[query] = future.result()
+            except Exception as e:
+                print(f"Web enrichment failed for '{query[:60]}': {e}")
+        return results
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
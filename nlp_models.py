@@ -0,0 +1,54 @@
+"""
+Shared spaCy pipelines, loaded on first use and at most once per process.
+
+scoring.py and backend.py both get their model from get_nlp() instead of
+calling spacy.load at import time. Components the domain inference never
+reads are excluded so they are not loaded at all.
+"""
+import threading
+from typing import Dict, Iterable, Tuple
+
+try:
+    import spacy
+except ImportError:
+    spacy = None
+
+DEFAULT_MODEL = "en_core_web_sm"
+
+# infer_project_domains reads doc.noun_chunks and doc.ents. English
+# noun_chunks walks the parser's dependencies but also filters on token.pos,
+# which comes from tagger + attribute_ruler; ents come from ner. Only the
+# lemmatizer is unused.
+DOMAIN_EXCLUDE: Tuple[str, ...] = ("lemmatizer",)
+
+_LOCK = threading.Lock()
+_MODELS: Dict[Tuple[str, Tuple[str, ...]], object] = {}
+_UNAVAILABLE = set()
+
+
+def get_nlp(model: str = DEFAULT_MODEL, exclude: Iterable[str] = DOMAIN_EXCLUDE):
+    """The shared pipeline for (model, exclude), or None if it cannot be loaded."""
+    key = (model, tuple(sorted(exclude)))
+    nlp = _MODELS.get(key)
+    if nlp is not None or key in _UNAVAILABLE:
+        return nlp
+    with _LOCK:
+        if key in _MODELS or key in _UNAVAILABLE:
+            return _MODELS.get(key)
+        nlp = _load(model, key[1])
+        if nlp is None:
+            _UNAVAILABLE.add(key)
+        else:
+            _MODELS[key] = nlp
+    return nlp
+
+
+def _load(model: str, exclude: Tuple[str, ...]):
+    if spacy is None:
+        print("Warning: spaCy is not installed. Install with: pip install spacy")
+        return None
+    try:
+        return spacy.load(model, exclude=list(exclude))
+    except OSError:
+        print(f"Warning: spaCy model not found. Install with: python -m spacy download {model}")
+        return None
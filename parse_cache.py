@@ -0,0 +1,154 @@
+"""
+Persistent, content-addressed cache for parsed resumes.
+
+Entries are keyed by the SHA-256 of the original file bytes and live in two
+levels under one root directory:
+
+    text/     extracted text from parser.load_text (expensive PDF/DOCX decode)
+    records/  full parse_file records, tagged with a parser/vocabulary version
+
+When only the extractors or skills.json change, the record level misses but
+the text level still hits, so the document is not decoded again. Total size
+is kept under max_bytes by evicting least-recently-used entries.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class ParseCache:
+    def __init__(self, root: Path, max_bytes: int = 512 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # path -> size, least recently used first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        for sub in ("text", "records"):
+            (self.root / sub).mkdir(parents=True, exist_ok=True)
+        self._scan()
+
+    def __reduce__(self):
+        # Worker processes rebuild their own view of the directory.
+        return (self.__class__, (self.root, self.max_bytes))
+
+    def _scan(self) -> None:
+        found = []
+        for sub in ("text", "records"):
+            for entry in os.scandir(self.root / sub):
+                if entry.is_file() and not entry.name.startswith("."):
+                    st = entry.stat()
+                    found.append((st.st_mtime_ns, entry.path, st.st_size))
+        for _, path, size in sorted(found):
+            self._entries[path] = size
+            self._total += size
+        self._evict()
+
+    # -----------------------------
+    # Keys
+    # -----------------------------
+    @staticmethod
+    def digest_bytes(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _text_path(self, digest: str, variant: str = "") -> Path:
+        if variant:
+            digest = f"{digest}-{hashlib.sha1(variant.encode('utf-8')).hexdigest()[:12]}"
+        return self.root / "text" / f"{digest}.txt"
+
+    def _record_path(self, digest: str, version: str) -> Path:
+        tag = hashlib.sha1(version.encode("utf-8")).hexdigest()[:12]
+        return self.root / "records" / f"{digest}-{tag}.json"
+
+    # -----------------------------
+    # Level 1: extracted text
+    # -----------------------------
+    def get_text(self, digest: str, variant: str = "") -> Optional[str]:
+        """variant separates texts extracted under different settings (e.g. parse limits)"""
+        path = self._text_path(digest, variant)
+        try:
+            text = path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        self._touch(path)
+        return text
+
+    def put_text(self, digest: str, text: str, variant: str = "") -> None:
+        self._write(self._text_path(digest, variant), text.encode("utf-8"))
+
+    # -----------------------------
+    # Level 2: parsed records
+    # -----------------------------
+    def get_record(self, digest: str, version: str) -> Optional[Dict]:
+        path = self._record_path(digest, version)
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        self._touch(path)
+        return record
+
+    def put_record(self, digest: str, version: str, record: Dict) -> None:
+        try:
+            data = json.dumps(record, ensure_ascii=False, default=str).encode("utf-8")
+        except (TypeError, ValueError):
+            return
+        self._write(self._record_path(digest, version), data)
+
+    # -----------------------------
+    # Storage and LRU eviction
+    # -----------------------------
+    def _write(self, path: Path, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            key = str(path)
+            self._total += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict()
+
+    def _touch(self, path: Path) -> None:
+        # mtime doubles as the recency stamp when another process rescans.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            key = str(path)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def _evict(self) -> None:
+        while self._total > self.max_bytes and self._entries:
+            path, size = self._entries.popitem(last=False)
+            self._total -= size
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self._entries:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total = 0
@@ -1,12 +1,29 @@
 # parser.py – FINAL UPDATED VERSION (with duplicate-word removal)
 
+import io
+import bisect
+import os
 import re
 import json
+import hashlib
+import threading
+import time
+import zipfile
+import multiprocessing as mp
+from multiprocessing import connection as mp_connection
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import BinaryIO, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Union
 import pandas as pd
 import fitz  # PyMuPDF
-from docx import Document
+
+from columnar import write_parquet
+from dedup import DuplicateDetector, minhash, signature_hex
+from docx_reader import docx_text
+from parse_cache import ParseCache
+from records import ParsedResume, records_to_frame
 
 # -----------------------------
 # Duplicate Word Removal
@@ -14,13 +31,12 @@ from docx import Document
 def remove_duplicate_words(text: str) -> str:
     if not isinstance(text, str):
         return text
-    words = text.split()
-    seen = []
+    seen = set()
     out = []
-    for w in words:
+    for w in text.split():
         lw = w.lower()
         if lw not in seen:
-            seen.append(lw)
+            seen.add(lw)
             out.append(w)
     return " ".join(out)
 
@@ -35,34 +51,298 @@ SECTION_HEADERS_EN = [
 
 SECTION_HEADERS_KN = ["ಶಿಕ್ಷಣ", "ಅನುಭವ", "ಪ್ರಾಜೆಕ್ಟ್", "ಕೌಶಲ್ಯ", "ಸಾರಾಂಶ", "ಸಂಪರ್ಕ"]
 
+# Header text -> canonical section key
+SECTION_KEYS = {
+    "education": "education", "experience": "experience", "work experience": "experience",
+    "projects": "projects", "project": "projects", "project details": "projects",
+    "skills": "skills", "technical skills": "skills", "soft skills": "skills",
+    "certifications": "certifications", "summary": "summary", "objective": "summary",
+    "contact": "contact", "achievements": "achievements",
+    "ಶಿಕ್ಷಣ": "education", "ಅನುಭವ": "experience", "ಪ್ರಾಜೆಕ್ಟ್": "projects",
+    "ಕೌಶಲ್ಯ": "skills", "ಸಾರಾಂಶ": "summary", "ಸಂಪರ್ಕ": "contact",
+}
+_UNMAPPED_HEADERS = set(SECTION_HEADERS_EN + SECTION_HEADERS_KN) - set(SECTION_KEYS)
+if _UNMAPPED_HEADERS:
+    raise RuntimeError(f"SECTION_KEYS has no entry for headers: {sorted(_UNMAPPED_HEADERS)}")
+
+_HEADER_STRIP = " \t\r\n:-–—•*#|.()[]"
+_MAX_HEADER_LEN = 40
+
+class SectionIndex:
+    """
+    Offsets of the section headers found in a resume.
+
+    Each section key maps to (header_start, body_start, end) spans; text
+    before the first header is the preamble, where the name and contact
+    details usually sit.
+    """
+
+    def __init__(self, text: str, spans: Dict[str, List[Tuple[int, int, int]]], preamble_end: int):
+        self.text = text
+        self.spans = spans
+        self.preamble_end = preamble_end
+
+    @property
+    def preamble(self) -> str:
+        return self.text[:self.preamble_end]
+
+    def has(self, key: str) -> bool:
+        return key in self.spans
+
+    def get(self, key: str, with_header: bool = False) -> str:
+        return "\n".join(self.text[h if with_header else b:e] for h, b, e in self.spans.get(key, ()))
+
+    def scope(self, key: str, with_header: bool = False) -> str:
+        """Text of the section, or the whole resume when the section is missing."""
+        return self.get(key, with_header) if key in self.spans else self.text
+
+def build_section_index(text: str) -> SectionIndex:
+    """One pass over the lines, recording where each known section header starts."""
+    headers = []
+    pos = 0
+    for line in text.splitlines(keepends=True):
+        start = pos
+        pos += len(line)
+        head, sep, rest = line.partition(":")
+        head = head.strip(_HEADER_STRIP)
+        if not head or len(head) > _MAX_HEADER_LEN:
+            continue
+        key = SECTION_KEYS.get(head.lower())
+        if key is None:
+            continue
+        # "Skills: Python, Java" starts the body right after the colon
+        body_start = pos - len(rest) if sep and rest.strip() else pos
+        headers.append((key, start, body_start))
+
+    spans: Dict[str, List[Tuple[int, int, int]]] = {}
+    for i, (key, h, b) in enumerate(headers):
+        end = headers[i + 1][1] if i + 1 < len(headers) else len(text)
+        spans.setdefault(key, []).append((h, b, end))
+    return SectionIndex(text, spans, headers[0][1] if headers else len(text))
+
 # -----------------------------
 # File Loading
 # -----------------------------
-def load_text(file_path: Path) -> str:
+class DocumentTooLarge(ValueError):
+    """The document is over ParseLimits.max_bytes."""
+
+# What a corrupt or mislabelled .pdf / .docx raises while being read
+CORRUPT_DOCUMENT_ERRORS = (fitz.FileDataError, zipfile.BadZipFile)
+
+@dataclass(frozen=True)
+class ParseLimits:
+    """
+    Worst-case input guards. None disables a limit.
+
+    max_bytes: PDF/DOCX files above it are rejected before decoding; text
+               files are read only up to it.
+    max_pages: PDF pages beyond it are not decoded.
+    max_chars: text extraction stops once this many characters are read.
+    The character cap is also the regex budget: every extractor runs over
+    at most max_chars of text.
+    """
+    max_bytes: Optional[int] = 20 * 1024 * 1024
+    max_pages: Optional[int] = 50
+    max_chars: Optional[int] = 200_000
+
+    @property
+    def tag(self) -> str:
+        return f"{self.max_bytes}-{self.max_pages}-{self.max_chars}"
+
+    def exceeds_bytes(self, size: int) -> bool:
+        return self.max_bytes is not None and size > self.max_bytes
+
+DEFAULT_LIMITS = ParseLimits()
+NO_LIMITS = ParseLimits(max_bytes=None, max_pages=None, max_chars=None)
+
+def load_text(file_path: Path, limits: Optional[ParseLimits] = None) -> str:
+    return read_document(file_path, limits)[0]
+
+def load_text_bytes(data: bytes, filename: str, limits: Optional[ParseLimits] = None) -> str:
+    """Same as load_text, but decodes an in-memory buffer instead of a file on disk."""
+    return read_document_bytes(data, filename, limits)[0]
+
+def read_document(file_path: Path, limits: Optional[ParseLimits] = None,
+                  page_workers: int = 1) -> Tuple[str, List[str]]:
+    """
+    Extract text from a file, returning it with the names of any limits that
+    truncated it. page_workers > 1 spreads the pages of long PDFs over that
+    many processes.
+    """
+    limits = limits or NO_LIMITS
+    truncated: List[str] = []
     ext = file_path.suffix.lower()
+    if ext in (".pdf", ".docx"):
+        _check_size(file_path.name, file_path.stat().st_size, limits)
     if ext == ".pdf":
-        with fitz.open(file_path) as doc:
-            return "\n".join(page.get_text() for page in doc)
+        text = _pdf_text(str(file_path), limits, truncated, page_workers)
     elif ext == ".docx":
-        doc = Document(str(file_path))
-        return "\n".join(p.text for p in doc.paragraphs)
+        text = docx_text(file_path, limits.max_chars)
     else:
-        return file_path.read_text(encoding="utf-8", errors="ignore")
+        with open(file_path, "rb") as f:
+            data = f.read(-1 if limits.max_bytes is None else limits.max_bytes + 1)
+        text = _plain_text(data, limits, truncated)
+    return _cap_chars(text, limits, truncated), truncated
+
+def read_document_bytes(data: bytes, filename: str, limits: Optional[ParseLimits] = None,
+                        page_workers: int = 1) -> Tuple[str, List[str]]:
+    limits = limits or NO_LIMITS
+    truncated: List[str] = []
+    ext = Path(filename).suffix.lower()
+    if ext in (".pdf", ".docx"):
+        _check_size(filename, len(data), limits)
+    if ext == ".pdf":
+        text = _pdf_text(data, limits, truncated, page_workers)
+    elif ext == ".docx":
+        text = docx_text(io.BytesIO(data), limits.max_chars)
+    else:
+        text = _plain_text(data, limits, truncated)
+    return _cap_chars(text, limits, truncated), truncated
+
+def _check_size(name: str, size: int, limits: ParseLimits) -> None:
+    if limits.exceeds_bytes(size):
+        raise DocumentTooLarge(f"{name} is {size} bytes, over the max_bytes limit of {limits.max_bytes}")
+
+# -----------------------------
+# PDF pages
+# -----------------------------
+PDF_PARALLEL_MIN_PAGES = 8  # below this a process round trip costs more than it saves
+
+def _open_pdf(source: Union[str, bytes]):
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+def _pdf_text(source: Union[str, bytes], limits: ParseLimits, truncated: List[str],
+              page_workers: int = 1) -> str:
+    with _open_pdf(source) as doc:
+        pages = doc.page_count
+        if limits.max_pages is not None and pages > limits.max_pages:
+            pages = limits.max_pages
+            truncated.append("pages")
+        # Folder pool workers are daemonic and cannot start processes of their own
+        if page_workers <= 1 or pages < PDF_PARALLEL_MIN_PAGES or mp.current_process().daemon:
+            return "\n".join(_pdf_pages(doc, 0, pages, limits.max_chars))
+    return "\n".join(_pdf_pages_parallel(source, pages, limits.max_chars, page_workers))
+
+def _page_text(page) -> str:
+    # A page that references no fonts (a scan, a full-page image) has no
+    # text to extract, so skip building its text page.
+    if not page.get_fonts():
+        return ""
+    return page.get_text()
+
+def _pdf_pages(doc, start: int, stop: int, max_chars: Optional[int]) -> List[str]:
+    parts = []
+    total = 0
+    for i in range(start, stop):
+        t = _page_text(doc[i])
+        parts.append(t)
+        total += len(t) + 1
+        if max_chars is not None and total > max_chars:
+            break
+    return parts
+
+def _pdf_range_worker(source: Union[str, bytes], start: int, stop: int,
+                      max_chars: Optional[int]) -> List[str]:
+    # Paths are opened by each worker; only in-memory PDFs are copied over.
+    with _open_pdf(source) as doc:
+        return _pdf_pages(doc, start, stop, max_chars)
+
+# One pool per worker count, kept for the life of the process: callers with
+# different page_workers (e.g. two app sessions) never share or close a pool
+# the other is using.
+_PAGE_POOLS: Dict[int, ProcessPoolExecutor] = {}
+_PAGE_POOL_LOCK = threading.Lock()
+
+def _page_pool(workers: int) -> ProcessPoolExecutor:
+    with _PAGE_POOL_LOCK:
+        pool = _PAGE_POOLS.get(workers)
+        if pool is None:
+            pool = _PAGE_POOLS[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+def _pdf_pages_parallel(source: Union[str, bytes], pages: int, max_chars: Optional[int],
+                        workers: int) -> List[str]:
+    # Contiguous page ranges, two per worker, collected in order. Once the
+    # char budget is spent the ranges not yet started are cancelled. Each
+    # range also stops on its own budget, which is never later than the
+    # overall cut, so the result matches the sequential read exactly.
+    step = -(-pages // (workers * 2))
+    pool = _page_pool(workers)
+    futures = [pool.submit(_pdf_range_worker, source, start, min(start + step, pages), max_chars)
+               for start in range(0, pages, step)]
+    parts = []
+    total = 0
+    try:
+        for fut in futures:
+            for t in fut.result():
+                parts.append(t)
+                total += len(t) + 1
+                if max_chars is not None and total > max_chars:
+                    return parts
+    finally:
+        for fut in futures:
+            fut.cancel()
+    return parts
+
+def _plain_text(data: bytes, limits: ParseLimits, truncated: List[str]) -> str:
+    if limits.exceeds_bytes(len(data)):
+        data = data[:limits.max_bytes]
+        truncated.append("bytes")
+    # Match Path.read_text: universal newlines
+    return data.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+
+def _cap_chars(text: str, limits: ParseLimits, truncated: List[str]) -> str:
+    if limits.max_chars is not None and len(text) > limits.max_chars:
+        truncated.append("chars")
+        return text[:limits.max_chars]
+    return text
+
+_SPACE_RUN_RE = re.compile(r"[ \t]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_KANNADA_RE = re.compile(r"[\u0C80-\u0CFF]")
+
+def normalize_text(text: str) -> Tuple[str, bool]:
+    """
+    clean_text and is_kannada in one call: two str.replace calls, two
+    precompiled substitutions and the Kannada search, i.e. five linear
+    passes rather than one. Fusing them into a single regex with a Python
+    callback measured ~3x slower, so the C-level passes are kept.
+    Returns (cleaned text, contains Kannada).
+    """
+    text = text.replace("\x00", " ").replace("\r", "\n")
+    text = _SPACE_RUN_RE.sub(" ", text)
+    text = _BLANK_LINES_RE.sub("\n\n", text).strip()
+    return text, _KANNADA_RE.search(text) is not None
 
 def clean_text(text: str) -> str:
-    text = text.replace("\x00", " ")
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\r", "\n", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    return text.strip()
+    return normalize_text(text)[0]
 
 def is_kannada(text: str) -> bool:
-    return bool(re.search(r"[\u0C80-\u0CFF]", text))
+    return _KANNADA_RE.search(text) is not None
 
 # -----------------------------
 # Name Extraction
 # -----------------------------
-def extract_name(text: str) -> Tuple[str, float]:
+def extract_name(text: str, sections: Optional[SectionIndex] = None) -> Tuple[str, float]:
+    # The name almost always sits above the first section header
+    if sections is not None and sections.preamble.strip():
+        found = _scan_name_lines(sections.preamble)
+        if found:
+            return found
+    found = _scan_name_lines(text)
+    if found:
+        return found
+
+    email = re.search(r"([a-zA-Z]+)[\._]?([a-zA-Z]+)?@", text)
+    if email:
+        n = f"{email.group(1).title()} {email.group(2).title() if email.group(2) else ''}".strip()
+        return n, 0.85
+
+    return "Unknown", 0.1
+
+def _scan_name_lines(text: str) -> Optional[Tuple[str, float]]:
     lines = [l for l in text.splitlines()[:30] if l.strip()]
     seen = set()
 
@@ -98,62 +378,208 @@ def extract_name(text: str) -> Tuple[str, float]:
                 seen.add(lower_name)
                 return name, 0.97
 
-    email = re.search(r"([a-zA-Z]+)[\._]?([a-zA-Z]+)?@", text)
-    if email:
-        n = f"{email.group(1).title()} {email.group(2).title() if email.group(2) else ''}".strip()
-        return n, 0.85
-
-    return "Unknown", 0.1
+    return None
 
 # -----------------------------
 # Contact Extraction
 # -----------------------------
-def extract_contacts(text: str) -> Tuple[Dict[str, str], float]:
-    phone = re.search(r"(\+91[- ]?)?[6-9]\d{9}", text)
-    email = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", text)
-    linkedin = re.search(r"(linkedin\.com/in/[A-Za-z0-9\-_]+)", text, re.I)
-    github = re.search(r"(github\.com/[A-Za-z0-9\-_]+)", text, re.I)
+# key -> (pattern, group, confidence weight)
+CONTACT_PATTERNS = {
+    "phone": (re.compile(r"(\+91[- ]?)?[6-9]\d{9}"), 0, 0.35),
+    "email": (re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"), 0, 0.35),
+    "linkedin": (re.compile(r"(linkedin\.com/in/[A-Za-z0-9\-_]+)", re.I), 1, 0.2),
+    "github": (re.compile(r"(github\.com/[A-Za-z0-9\-_]+)", re.I), 1, 0.2),
+}
+
+def extract_contacts(text: str, sections: Optional[SectionIndex] = None) -> Tuple[Dict[str, str], float]:
+    # A resume with a contact section is searched there and in the preamble
+    # only; without one, the whole text is searched once.
+    scope = text
+    if sections is not None and sections.has("contact"):
+        scope = sections.get("contact") + "\n" + sections.preamble
+
+    found = {}
+    for key, (pattern, group, _) in CONTACT_PATTERNS.items():
+        m = pattern.search(scope)
+        if m:
+            found[key] = m.group(group)
 
     out = {}
     score = 0.0
-
-    if phone: out["phone"] = phone.group(0); score += 0.35
-    if email: out["email"] = email.group(0); score += 0.35
-    if linkedin: out["linkedin"] = linkedin.group(1); score += 0.2
-    if github: out["github"] = github.group(1); score += 0.2
+    for key, (_, _, weight) in CONTACT_PATTERNS.items():
+        if key in found:
+            out[key] = found[key]
+            score += weight
 
     return out, min(score, 0.99)
 
 # -----------------------------
 # Skills
 # -----------------------------
+DEFAULT_SKILLS = ["python", "java", "react", "django", "flask", "aws", "docker"]
+
 def load_skills_dict(skills_path: Path) -> List[str]:
+    return list(get_vocabulary(skills_path).skills)
+
+class SkillMatcher:
+    """
+    Finds every vocabulary skill in one scan of the lowercased text.
+
+    All skills are folded into a single trie-shaped alternation so the regex
+    engine walks shared prefixes once instead of running one search per skill.
+    The match sits in a lookahead, so every start position is tried and
+    overlapping skills are still found. At a given start the engine reports
+    the longest skill with a valid right boundary; the shorter skills that
+    also match there are exactly its boundary-respecting prefixes, which are
+    precomputed.
+    """
+
+    def __init__(self, skills_list: List[str]):
+        self.size = len(skills_list)
+        self._titles: Dict[str, set] = {}
+        for skill in skills_list:
+            self._titles.setdefault(skill.lower(), set()).add(skill.title())
+
+        # An empty skill cannot live in the trie; keep today's regex for it.
+        self._empty = self._titles.pop("", None)
+
+        trie: Dict = {}
+        for low in self._titles:
+            node = trie
+            for ch in low:
+                node = node.setdefault(ch, {})
+            node[""] = True
+
+        self._implied: Dict[str, List[str]] = {}
+        for low in self._titles:
+            node = trie
+            prefixes = []
+            for i, ch in enumerate(low[:-1]):
+                node = node[ch]
+                if "" in node and not _is_word_char(low[i + 1]):
+                    prefixes.append(low[:i + 1])
+            self._implied[low] = prefixes
+
+        self._regex = (
+            re.compile(rf"(?<![a-z0-9])(?=({_trie_pattern(trie)})(?![a-z0-9]))")
+            if trie else None
+        )
+
+    def find(self, low: str) -> set:
+        """Return the titled skills present in already-lowercased text."""
+        found = set()
+        if self._regex is not None:
+            hits = set()
+            for m in self._regex.finditer(low):
+                hits.add(m.group(1))
+            for low_skill in list(hits):
+                hits.update(self._implied[low_skill])
+            for low_skill in hits:
+                found |= self._titles[low_skill]
+        if self._empty and re.search(r"(?<![a-z0-9])(?![a-z0-9])", low):
+            found |= self._empty
+        return found
+
+def _is_word_char(ch: str) -> bool:
+    return "a" <= ch <= "z" or "0" <= ch <= "9"
+
+def _trie_pattern(node: Dict) -> str:
+    # Longer continuations come first and the empty branch last, so the
+    # alternation is greedy and backtracks to shorter skills when the right
+    # boundary fails.
+    alts = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if "" in node:
+        alts.append("")
+    if len(alts) == 1:
+        return alts[0]
+    return "(?:" + "|".join(alts) + ")"
+
+@lru_cache(maxsize=8)
+def _cached_matcher(skills: Tuple[str, ...]) -> SkillMatcher:
+    return SkillMatcher(list(skills))
+
+def compile_skill_matcher(skills_list: List[str]) -> SkillMatcher:
+    return _cached_matcher(tuple(skills_list))
+
+# -----------------------------
+# Shared Vocabulary Registry
+# -----------------------------
+@dataclass(frozen=True)
+class SkillsVocabulary:
+    skills: Tuple[str, ...]
+    digest: str
+    matcher: SkillMatcher
+
+_VOCAB_LOCK = threading.Lock()
+_VOCAB_REGISTRY: Dict[str, Tuple[Tuple[int, int], SkillsVocabulary]] = {}
+
+def _build_vocabulary(skills, digest: str) -> SkillsVocabulary:
+    skills = tuple(skills)
+    return SkillsVocabulary(skills=skills, digest=digest, matcher=compile_skill_matcher(skills))
+
+def get_vocabulary(skills_path: Path) -> SkillsVocabulary:
+    """
+    Process-wide skills vocabulary for a skills.json path.
+
+    The file is read and its matcher compiled once; later calls only stat the
+    file and reload when its mtime or size changes. A touched file with the
+    same content hash keeps the existing vocabulary object.
+    """
+    key = os.path.abspath(skills_path)
     try:
-        return json.loads(skills_path.read_text())
-    except:
-        return ["python", "java", "react", "django", "flask", "aws", "docker"]
-
-def extract_skills(text: str, skills_list: List[str]) -> Tuple[List[str], float]:
-    found = set()
-    low = text.lower()
-    for skill in skills_list:
-        if re.search(rf"(?<![a-z0-9]){re.escape(skill.lower())}(?![a-z0-9])", low):
-            found.add(skill.title())
+        st = os.stat(key)
+    except OSError:
+        return _build_vocabulary(DEFAULT_SKILLS, "default")
+    stamp = (st.st_mtime_ns, st.st_size)
+
+    entry = _VOCAB_REGISTRY.get(key)
+    if entry and entry[0] == stamp:
+        return entry[1]
+
+    with _VOCAB_LOCK:
+        entry = _VOCAB_REGISTRY.get(key)
+        if entry and entry[0] == stamp:
+            return entry[1]
+        try:
+            data = Path(key).read_bytes()
+        except OSError:
+            return _build_vocabulary(DEFAULT_SKILLS, "default")
+        digest = hashlib.sha256(data).hexdigest()
+        if entry and entry[1].digest == digest:
+            vocab = entry[1]
+        else:
+            try:
+                skills = json.loads(data)
+            except ValueError:
+                skills = DEFAULT_SKILLS
+            vocab = _build_vocabulary(skills, digest)
+        _VOCAB_REGISTRY[key] = (stamp, vocab)
+        return vocab
+
+def extract_skills(text: str, skills_list: List[str], matcher: SkillMatcher = None) -> Tuple[List[str], float]:
+    if matcher is None:
+        matcher = compile_skill_matcher(skills_list)
+    found = matcher.find(text.lower())
     score = 0.1 if not found else min(0.3 + 0.7 * len(found) / max(1, len(skills_list)//5), 0.98)
     return sorted(found), score
 
 # -----------------------------
 # CGPA
 # -----------------------------
-def extract_cgpa(text: str) -> Tuple[str, float]:
-    patterns = [
-        r"CGPA.*?(\d+\.\d{1,2})",
-        r"GPA.*?(\d+\.\d{1,2})",
-        r"(\d+\.\d{1,2})\s*/\s*10",
-        r"(\d+\.\d{1,2})\s*out\s*of\s*10"
-    ]
-    for p in patterns:
-        m = re.search(p, text, re.I)
+CGPA_PATTERNS = [
+    re.compile(r"CGPA.*?(\d+\.\d{1,2})", re.I),
+    re.compile(r"GPA.*?(\d+\.\d{1,2})", re.I),
+    re.compile(r"(\d+\.\d{1,2})\s*/\s*10", re.I),
+    re.compile(r"(\d+\.\d{1,2})\s*out\s*of\s*10", re.I),
+]
+
+def extract_cgpa(text: str, sections: Optional[SectionIndex] = None) -> Tuple[str, float]:
+    # Only the education section when there is one, else the whole text
+    scope = text
+    if sections is not None and sections.has("education"):
+        scope = sections.get("education")
+    for p in CGPA_PATTERNS:
+        m = p.search(scope)
         if m:
             return m.group(1), 0.99
     return "", 0.0
@@ -161,13 +587,31 @@ def extract_cgpa(text: str) -> Tuple[str, float]:
 # ------------------------------------------------
 # Project Extraction
 # ------------------------------------------------
+PROJECT_SECTION_RE = re.compile(r"(?si)(projects?|project details)\s*[:\-]?\s*(.+?)(\n[A-Z][A-Za-z ]{3,}|$)")
+NUMBERED_ITEM_RE = re.compile(r"(?m)^\s*(\d+\.|\(\d+\))\s*(.+)")
+BULLET_ITEM_RE = re.compile(r"(?m)^\s*[-•*]\s*(.+)")
+# A numbered item's description runs until the next "\n1." or "\nUPPER" line
+_ITEM_END_RE = re.compile(r"\n(?=\d+\.|[A-Z ]{3})")
+_WHITESPACE_RE = re.compile(r"\s*")
+MAX_PROJECTS = 10
+
 def extract_projects(text: str) -> Tuple[List[str], float]:
-    projects = []
+    final = []
+    seen = set()
+    for p in _iter_project_candidates(text):
+        p = p.strip(" .-_")
+        if len(p) > 5 and p not in seen:
+            seen.add(p)
+            final.append(p)
+            if len(final) == MAX_PROJECTS:
+                break
+
+    return final, (0.9 if final else 0.0)
 
-    sec = re.search(
-        r"(?si)(projects?|project details)\s*[:\-]?\s*(.+?)(\n[A-Z][A-Za-z ]{3,}|$)",
-        text
-    )
+def _iter_project_candidates(text: str) -> Iterator[str]:
+    # Candidates come in priority order (section block, numbered items,
+    # bullets) and are produced lazily, so extraction stops at MAX_PROJECTS.
+    sec = PROJECT_SECTION_RE.search(text)
     if sec:
         block = sec.group(2)
         lines = [l.strip() for l in block.split("\n") if len(l.strip()) > 2]
@@ -191,34 +635,58 @@ def extract_projects(text: str) -> Tuple[List[str], float]:
             title = c[0]
             desc = "; ".join([d.lstrip("•-* ") for d in c[1:]])
             if desc:
-                projects.append(f"{title} – {desc}")
+                yield f"{title} – {desc}"
             else:
-                projects.append(title)
-
-    numbered = re.findall(r"(?m)^\s*(\d+\.|\(\d+\))\s*(.+)", text)
-    for _, title in numbered:
-        title = title.strip()
-        pattern = rf"{re.escape(title)}\s*\n(.+?)(\n\d+\.|\n[A-Z ]{{3,}}|$)"
-        desc = re.search(pattern, text, re.S)
-        if desc:
-            block = desc.group(1).strip()
-            block = re.sub(r"\n{1,2}", " ", block)
-            projects.append(f"{title} – {block}")
+                yield title
+
+    item_ends = None
+    described: Dict[str, Optional[str]] = {}
+    for m in NUMBERED_ITEM_RE.finditer(text):
+        title = m.group(2).strip()
+        if title not in described:
+            if item_ends is None:
+                item_ends = _item_end_offsets(text)
+            described[title] = _numbered_item_description(text, title, item_ends)
+        block = described[title]
+        if block is not None:
+            block = re.sub(r"\n{1,2}", " ", block.strip())
+            yield f"{title} – {block}"
         else:
-            projects.append(title)
+            yield title
 
-    bullets = re.findall(r"(?m)^\s*[-•*]\s*(.+)", text)
-    for b in bullets:
+    for m in BULLET_ITEM_RE.finditer(text):
+        b = m.group(1)
         if len(b) > 5:
-            projects.append(b.strip())
+            yield b.strip()
 
-    final = []
-    for p in projects:
-        p = p.strip(" .-_")
-        if len(p) > 5 and p not in final:
-            final.append(p)
+def _item_end_offsets(text: str) -> List[int]:
+    """Sorted offsets where a numbered item's description may stop (one pass)."""
+    ends = [m.start() for m in _ITEM_END_RE.finditer(text)]
+    if text.endswith("\n"):
+        ends.append(len(text) - 1)
+    ends.append(len(text))
+    return ends
 
-    return final[:10], (0.9 if final else 0.0)
+def _numbered_item_description(text: str, title: str, item_ends: List[int]) -> Optional[str]:
+    """
+    Text following the first occurrence of `title` that ends a line, up to
+    the next item boundary. The occurrence is located with str.find and the
+    boundary by bisecting the precomputed offsets, so no regex is compiled
+    or re-run over the document per item.
+    """
+    n = len(text)
+    i = text.find(title)
+    while i != -1:
+        j = i + len(title)
+        run_end = _WHITESPACE_RE.match(text, j).end()
+        # The description starts after the last newline of the whitespace
+        # run, and must be at least one character long.
+        nl = text.rfind("\n", j, min(run_end, n - 1))
+        if nl != -1:
+            start = nl + 1
+            return text[start:item_ends[bisect.bisect_left(item_ends, start + 1)]]
+        i = text.find(title, i + 1)
+    return None
 
 # ------------------------------------------------
 # Experience (simplified)
@@ -229,59 +697,632 @@ def extract_experience(text: str) -> Tuple[List[Dict], float]:
 def section_confidence_map(d: Dict[str, float]) -> Dict[str, int]:
     return {k: int(round(v * 100)) for k, v in d.items()}
 
+# ------------------------------------------------
+# Field Selection
+# ------------------------------------------------
+ALL_FIELDS = frozenset(["name", "contacts", "skills", "cgpa", "projects", "experience", "language", "minhash"])
+_SECTION_FIELDS = frozenset(["name", "contacts", "cgpa", "projects"])
+
+# "file", "confidence" and "raw_text" are always present
+PARSE_PROFILES = {
+    "full": ALL_FIELDS,
+    "triage": frozenset(["skills", "minhash"]),
+}
+
+def resolve_fields(fields: Optional[Iterable[str]] = None, profile: str = "full") -> FrozenSet[str]:
+    """Explicit fields win over the named profile."""
+    if fields is None:
+        if profile not in PARSE_PROFILES:
+            raise ValueError(f"Unknown parse profile {profile!r}; expected one of {sorted(PARSE_PROFILES)}")
+        return PARSE_PROFILES[profile]
+    fields = frozenset(fields)
+    unknown = fields - ALL_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown fields {sorted(unknown)}; expected a subset of {sorted(ALL_FIELDS)}")
+    return fields
+
+# ------------------------------------------------
+# Stage Timing
+# ------------------------------------------------
+TimingOption = Union[bool, Callable[[str, Dict[str, float]], None]]
+
+class StageClock:
+    """Wall time per parse stage, recorded as the lap since the previous stage."""
+    __slots__ = ("timings", "_last")
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.timings[stage] = self.timings.get(stage, 0.0) + now - self._last
+        self._last = now
+
+class _NullClock:
+    __slots__ = ()
+
+    def lap(self, stage: str) -> None:
+        pass
+
+_NULL_CLOCK = _NullClock()
+
+def _report_timings(record: ParsedResume, clock, timing: TimingOption) -> ParsedResume:
+    if timing is True:
+        record.timings = clock.timings
+    elif callable(timing):
+        timing(record.file, clock.timings)
+    return record
+
+def timing_summary(records) -> pd.DataFrame:
+    """
+    p50/p95/total per stage (milliseconds) over records parsed with
+    timing=True; accepts a DataFrame or an iterable of records.
+    """
+    if isinstance(records, pd.DataFrame):
+        rows = records["timings"].tolist() if "timings" in records.columns else []
+    else:
+        rows = [r.get("timings") for r in records]
+    frame = pd.DataFrame([t for t in rows if isinstance(t, dict)])
+    if frame.empty:
+        return pd.DataFrame(columns=["count", "p50_ms", "p95_ms", "total_ms"])
+    return pd.DataFrame({
+        "count": frame.count(),
+        "p50_ms": frame.quantile(0.5) * 1e3,
+        "p95_ms": frame.quantile(0.95) * 1e3,
+        "total_ms": frame.sum() * 1e3,
+    }).rename_axis("stage")
+
 # ------------------------------------------------
 # Parse a Single File
 # ------------------------------------------------
-def parse_file(path: Path, skills_path: Path) -> Dict:
-    raw = load_text(path)
-    text = clean_text(raw)
-    skills_list = load_skills_dict(skills_path)
-
-    name, c_name = extract_name(text)
-    name = remove_duplicate_words(name)           # 🔥 FIX DUPLICATE NAMES
-
-    contacts, c_contact = extract_contacts(text)
-
-    skills, c_skills = extract_skills(text, skills_list)
-    skills = list(dict.fromkeys(skills))          # 🔥 FIX DUP SKILLS
-
-    cgpa, c_cgpa = extract_cgpa(text)
-
-    projects, c_proj = extract_projects(text)
-    projects = [remove_duplicate_words(p) for p in projects]  # 🔥 FIX DUP PROJECT TITLES
-
-    education = ""
-    experience, c_exp = extract_experience(text)
-
-    conf = section_confidence_map({
-        "name": c_name, "contact": c_contact, "skills": c_skills,
-        "education": 0.5, "cgpa": c_cgpa,
-        "projects": c_proj, "experience": c_exp
-    })
-
-    return {
-        "file": path.name,
-        "name": name,
-        "contacts": contacts,
-        "skills": skills,
-        "cgpa": cgpa,
-        "projects": projects,
-        "projects_text": " ".join(projects),
-        "experience": experience,
-        "confidence": conf,
-        "language": "Kannada" if is_kannada(text) else "English",
-        "raw_text": text
-    }
+PARSER_VERSION = "4"  # bump whenever an extractor's output changes
+TEXT_VERSION = "3"    # bump whenever a document reader's output changes
+
+def parse_file(path: Path, skills_path: Path, cache: Optional[ParseCache] = None,
+               limits: Optional[ParseLimits] = DEFAULT_LIMITS,
+               timing: TimingOption = False, fields: Optional[Iterable[str]] = None,
+               profile: str = "full", page_workers: int = 1,
+               dedup: Optional[DuplicateDetector] = None) -> ParsedResume:
+    """
+    Parse one resume file. See parse_bytes for the options.
+    """
+    limits = limits or NO_LIMITS
+    fields = resolve_fields(fields, profile)
+    clock = StageClock() if timing else _NULL_CLOCK
+    vocab = get_vocabulary(skills_path)
+    if cache is not None and not limits.exceeds_bytes(path.stat().st_size):
+        data = path.read_bytes()
+        clock.lap("read")
+        record = _parse_buffer(data, path.name, vocab, cache, limits, clock, fields, page_workers, dedup)
+    else:
+        raw, truncated = read_document(path, limits, page_workers)
+        clock.lap("load_text")
+        record = _build_record(raw, path.name, vocab, truncated, clock, fields, dedup)
+    return _report_timings(record, clock, timing)
+
+def parse_bytes(data: Union[bytes, BinaryIO], filename: str, skills_path: Path,
+                cache: Optional[ParseCache] = None,
+                limits: Optional[ParseLimits] = DEFAULT_LIMITS,
+                timing: TimingOption = False, fields: Optional[Iterable[str]] = None,
+                profile: str = "full", page_workers: int = 1,
+                dedup: Optional[DuplicateDetector] = None) -> ParsedResume:
+    """
+    Parse a resume held in memory (raw bytes or a binary file-like object),
+    e.g. an upload, without writing it to disk first. `filename` is only
+    used for its extension and the record's "file" field.
+
+    timing=True attaches per-stage wall times (seconds) to the record under
+    "timings"; a callable is instead called as sink(file_name, timings).
+    fields (or a named profile such as "triage") limits which extractors
+    run; the others are skipped and their keys left out of the record.
+    page_workers > 1 extracts long PDFs' pages in that many processes.
+    With a dedup detector, a near-duplicate of a resume it already knows
+    is flagged with duplicate_of (its fields are still extracted).
+    """
+    if hasattr(data, "read"):
+        data = data.read()
+    limits = limits or NO_LIMITS
+    fields = resolve_fields(fields, profile)
+    clock = StageClock() if timing else _NULL_CLOCK
+    vocab = get_vocabulary(skills_path)
+    record = _parse_buffer(data, filename, vocab, cache, limits, clock, fields, page_workers, dedup)
+    return _report_timings(record, clock, timing)
+
+def _parse_buffer(data: bytes, filename: str, vocab: SkillsVocabulary,
+                  cache: Optional[ParseCache], limits: ParseLimits, clock,
+                  fields: FrozenSet[str], page_workers: int = 1,
+                  dedup: Optional[DuplicateDetector] = None) -> ParsedResume:
+    if cache is None:
+        raw, truncated = read_document_bytes(data, filename, limits, page_workers)
+        clock.lap("load_text")
+        return _build_record(raw, filename, vocab, truncated, clock, fields, dedup)
+
+    digest = ParseCache.digest_bytes(data)
+    text_variant = f"{TEXT_VERSION}:{limits.tag}"
+    version = f"{PARSER_VERSION}:{vocab.digest}:{text_variant}"
+    if fields != ALL_FIELDS:
+        version += ":" + ",".join(sorted(fields))
+    cached = cache.get_record(digest, version)
+    if cached is not None:
+        record = ParsedResume.from_dict(cached)
+        record.file = filename
+        clock.lap("cache")
+        return dedup.observe(record) if dedup is not None else record
+
+    truncated: List[str] = []
+    raw = cache.get_text(digest, text_variant)
+    if raw is None:
+        raw, truncated = read_document_bytes(data, filename, limits, page_workers)
+        # Truncated text is not reusable as-is; the record level still caches it
+        if not truncated:
+            cache.put_text(digest, raw, text_variant)
+    clock.lap("load_text")
+    record = _build_record(raw, filename, vocab, truncated, clock, fields, dedup)
+    if record.duplicate_of is None:
+        cache.put_record(digest, version, record.to_dict())
+    return record
+
+def _build_record(raw: str, file_name: str, vocab: SkillsVocabulary,
+                  truncated: Optional[List[str]] = None, clock=None,
+                  fields: FrozenSet[str] = ALL_FIELDS,
+                  dedup: Optional[DuplicateDetector] = None) -> ParsedResume:
+    clock = clock or _NULL_CLOCK
+    text, kannada = normalize_text(raw)
+    clock.lap("clean_text")
+
+    signature = original = None
+    if "minhash" in fields or dedup is not None:
+        signature = minhash(text)
+        clock.lap("minhash")
+    if dedup is not None and signature is not None:
+        original = dedup.find(signature, exclude=file_name)
+
+    sections = None
+    if fields & _SECTION_FIELDS:
+        sections = build_section_index(text)
+        clock.lap("sections")
+
+    record = ParsedResume(file_name)
+    conf = {}
+
+    if "name" in fields:
+        name, conf["name"] = extract_name(text, sections)
+        record.name = remove_duplicate_words(name)   # 🔥 FIX DUPLICATE NAMES
+        clock.lap("name")
+
+    if "contacts" in fields:
+        record.contacts, conf["contact"] = extract_contacts(text, sections)
+        clock.lap("contacts")
+
+    if "skills" in fields:
+        skills, conf["skills"] = extract_skills(text, vocab.skills, vocab.matcher)
+        record.skills = list(dict.fromkeys(skills))  # 🔥 FIX DUP SKILLS
+        clock.lap("skills")
+
+    if "cgpa" in fields:
+        conf["education"] = 0.5
+        record.cgpa, conf["cgpa"] = extract_cgpa(text, sections)
+        clock.lap("cgpa")
+
+    if "projects" in fields:
+        projects, conf["projects"] = extract_projects(sections.scope("projects", with_header=True))
+        projects = [remove_duplicate_words(p) for p in projects]  # 🔥 FIX DUP PROJECT TITLES
+        record.projects = projects
+        record.projects_text = " ".join(projects)
+        clock.lap("projects")
+
+    if "experience" in fields:
+        record.experience, conf["experience"] = extract_experience(text)
+        clock.lap("experience")
+
+    conf = section_confidence_map(conf)
+    if truncated:
+        conf["truncated"] = 1
+    record.confidence = conf
+
+    if "language" in fields:
+        record.language = "Kannada" if kannada else "English"
+        clock.lap("language")
+
+    if signature is not None:
+        record.minhash = signature_hex(signature)
+    if original is not None:
+        record.duplicate_of = original
+    elif dedup is not None and signature is not None:
+        dedup.add(file_name, signature)
+
+    record.raw_text = text
+    return record
 
 # ------------------------------------------------
 # Parse an Entire Folder
 # ------------------------------------------------
-def parse_folder(folder: Path, skills_path: Path) -> pd.DataFrame:
-    records = []
-    for p in folder.glob("*"):
-        if p.suffix.lower() in (".pdf", ".docx", ".txt"):
+# A task is a file on disk or an archive member: (name, bytes), or
+# (name, exception) when the member could not be read.
+ParseTask = Union[Path, Tuple[str, Union[bytes, Exception]]]
+
+def _task_name(task: ParseTask) -> str:
+    return task.name if isinstance(task, Path) else task[0]
+
+def _parse_task_safe(task: ParseTask, skills_path: Path, options: Dict) -> ParsedResume:
+    try:
+        if isinstance(task, Path):
+            return parse_file(task, skills_path, **options)
+        name, payload = task
+        if isinstance(payload, Exception):
+            raise payload
+        return parse_bytes(payload, name, skills_path, **options)
+    except Exception as e:
+        return ParsedResume(_task_name(task), error=str(e))
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+ARCHIVE_EXTENSIONS = (".zip",)
+
+def list_resume_files(folder: Path) -> Iterator[Path]:
+    """Resumes and .zip archives directly inside `folder`."""
+    return (p for p in folder.glob("*")
+            if p.suffix.lower() in SUPPORTED_EXTENSIONS + ARCHIVE_EXTENSIONS)
+
+# ------------------------------------------------
+# Zip Archives
+# ------------------------------------------------
+def source_file(record_name: str) -> str:
+    """The folder entry a record came from: "cvs.zip/a/jane.pdf" -> "cvs.zip"."""
+    return record_name.split("/", 1)[0]
+
+MAX_ARCHIVE_DEPTH = 3                         # zip inside zip inside zip
+MAX_NESTED_ARCHIVE_BYTES = 256 * 1024 * 1024  # nested archives are read into memory
+
+def is_archive(name: str) -> bool:
+    return Path(name).suffix.lower() in ARCHIVE_EXTENSIONS
+
+def iter_archive_members(source: Union[Path, bytes, BinaryIO], archive_name: str,
+                         limits: Optional[ParseLimits] = DEFAULT_LIMITS,
+                         depth: int = 0) -> Iterator[Tuple[str, Union[bytes, Exception]]]:
+    """
+    Yield (name, bytes) for every resume in a .zip, walking sub-folders and
+    nested archives, one member in memory at a time. Names keep the path
+    inside the archive ("cvs.zip/2024/jane.pdf"). Members that cannot be
+    read come out as (name, exception) so they still get a row.
+    """
+    limits = limits or NO_LIMITS
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    try:
+        zf = zipfile.ZipFile(source)
+    except (zipfile.BadZipFile, OSError) as e:
+        yield archive_name, ValueError(f"{archive_name} is not a readable zip archive: {e}")
+        return
+    with zf:
+        for info in zf.infolist():
+            inner = info.filename.replace("\\", "/")
+            base = inner.rsplit("/", 1)[-1]
+            if info.is_dir() or not base or base.startswith(".") or inner.startswith("__MACOSX/"):
+                continue
+            name = f"{archive_name}/{inner}"
+            ext = Path(base).suffix.lower()
+            if ext in ARCHIVE_EXTENSIONS:
+                if depth + 1 >= MAX_ARCHIVE_DEPTH:
+                    yield name, ValueError(f"{name}: archives nested more than {MAX_ARCHIVE_DEPTH} deep are not parsed")
+                elif info.file_size > MAX_NESTED_ARCHIVE_BYTES:
+                    yield name, ValueError(f"{name} is {info.file_size} bytes, over the nested archive limit")
+                else:
+                    try:
+                        data = zf.read(info)
+                    except Exception as e:
+                        yield name, e
+                        continue
+                    yield from iter_archive_members(data, name, limits, depth + 1)
+                continue
+            if ext not in SUPPORTED_EXTENSIONS:
+                continue
             try:
-                records.append(parse_file(p, skills_path))
+                if ext == ".txt" and limits.max_bytes is not None:
+                    # Plain text is truncated, not rejected; read just past the cap
+                    with zf.open(info) as f:
+                        data = f.read(limits.max_bytes + 1)
+                else:
+                    _check_size(name, info.file_size, limits)
+                    data = zf.read(info)
             except Exception as e:
-                records.append({"file": p.name, "error": str(e)})
-    return pd.DataFrame(records)
+                yield name, e
+                continue
+            yield name, data
+
+def _expand_tasks(paths: Iterable[Path], limits: Optional[ParseLimits]) -> Iterator[ParseTask]:
+    for p in paths:
+        if is_archive(p.name):
+            yield from iter_archive_members(p, p.name, limits)
+        else:
+            yield p
+
+def iter_parse_folder(folder: Path, skills_path: Path, workers: int = 1,
+                      timeout: Optional[float] = None,
+                      chunk_size: Optional[int] = None, **parse_options) -> Iterator:
+    """
+    Yield parsed records as files finish, in folder listing order.
+    See iter_parse_paths for the options.
+    """
+    return iter_parse_paths(list_resume_files(folder), skills_path, workers=workers,
+                            timeout=timeout, chunk_size=chunk_size, **parse_options)
+
+def iter_parse_paths(paths: Iterable[Path], skills_path: Path, workers: int = 1,
+                     timeout: Optional[float] = None,
+                     chunk_size: Optional[int] = None, **parse_options) -> Iterator:
+    """
+    Yield parsed records as files finish, in the order of `paths`. A .zip
+    path yields one record per resume inside it (see iter_archive_members).
+
+    With chunk_size set, lists of up to chunk_size records are yielded
+    instead, so callers can batch writes while keeping memory bounded.
+    With workers > 1 (or a timeout) files are parsed in a pool of worker
+    processes; a file running longer than `timeout` seconds has its worker
+    killed and becomes an `error` row; a callable timing sink is still
+    called in this process, as records arrive. Remaining keyword arguments
+    (e.g. cache) are passed through to parse_file.
+    """
+    tasks = _expand_tasks(paths, parse_options.get("limits", DEFAULT_LIMITS))
+    return _iter_parse_tasks(tasks, skills_path, workers, timeout, chunk_size, parse_options)
+
+def iter_parse_archive(source: Union[Path, bytes, BinaryIO], skills_path: Path,
+                       archive_name: Optional[str] = None, workers: int = 1,
+                       timeout: Optional[float] = None,
+                       chunk_size: Optional[int] = None, **parse_options) -> Iterator:
+    """
+    Parse every resume in a .zip given as a path or in memory (e.g. an
+    upload), without extracting it to disk. Options as for iter_parse_paths.
+    """
+    if archive_name is None:
+        archive_name = source.name if isinstance(source, Path) else "archive.zip"
+    tasks = iter_archive_members(source, archive_name, parse_options.get("limits", DEFAULT_LIMITS))
+    return _iter_parse_tasks(tasks, skills_path, workers, timeout, chunk_size, parse_options)
+
+def _iter_parse_tasks(tasks: Iterable[ParseTask], skills_path: Path, workers: int,
+                      timeout: Optional[float], chunk_size: Optional[int],
+                      parse_options: Dict) -> Iterator:
+    if workers > 1 or timeout is not None:
+        # Workers cannot share the detector or call back into this process;
+        # records are checked, and timing sinks called, as they arrive
+        options = dict(parse_options)
+        dedup = options.pop("dedup", None)
+        sink = options.get("timing")
+        if callable(sink):
+            options["timing"] = True
+        records = _iter_parse_parallel(tasks, skills_path, max(1, workers), timeout, options)
+        if callable(sink):
+            records = _forward_timings(records, sink)
+        if dedup is not None:
+            records = (dedup.observe(r) for r in records)
+    else:
+        records = (_parse_task_safe(t, skills_path, parse_options) for t in tasks)
+
+    if not chunk_size:
+        yield from records
+        return
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _forward_timings(records: Iterable[ParsedResume], sink: Callable) -> Iterator[ParsedResume]:
+    for record in records:
+        if record.timings is not None:
+            sink(record.file, record.timings)
+            record.timings = None
+        yield record
+
+def parse_folder(folder: Path, skills_path: Path, workers: int = 1,
+                 timeout: Optional[float] = None, **parse_options) -> pd.DataFrame:
+    """
+    Parse a folder into one DataFrame. With timing=True the per-stage
+    summary is also left in df.attrs["timing_summary"] as a plain dict,
+    {stage: {"count", "p50_ms", "p95_ms", "total_ms"}}, so frames can still
+    be concatenated; pd.DataFrame.from_dict(..., orient="index") restores it.
+    """
+    df = records_to_frame(iter_parse_folder(folder, skills_path, workers=workers,
+                                            timeout=timeout, **parse_options))
+    if parse_options.get("timing") is True:
+        df.attrs["timing_summary"] = timing_summary(df).to_dict(orient="index")
+    return df
+
+def parse_folder_to_parquet(folder: Path, skills_path: Path, out_path: Path,
+                            workers: int = 1, timeout: Optional[float] = None,
+                            batch_size: int = 1000, **parse_options) -> int:
+    """
+    Stream a folder's records into a Parquet file (see columnar.py) without
+    holding them all in memory. Returns the number of rows written.
+    """
+    return write_parquet(iter_parse_folder(folder, skills_path, workers=workers,
+                                           timeout=timeout, **parse_options),
+                         out_path, batch_size=batch_size)
+
+# ------------------------------------------------
+# Incremental Folder Ingestion
+# ------------------------------------------------
+MANIFEST_NAME = ".parse_manifest.json"
+
+@dataclass
+class IngestResult:
+    records: pd.DataFrame  # rows for new/changed files (plus any not in known_files)
+    changed: List[str]     # new or modified files that were parsed
+    unchanged: List[str]   # files skipped because the manifest still matches
+    deleted: List[str]     # files in the manifest that are gone from the folder
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _load_manifest(manifest_path: Path) -> Dict:
+    try:
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def _save_manifest(manifest_path: Path, manifest: Dict) -> None:
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = manifest_path.with_name(manifest_path.name + ".tmp")
+    tmp.write_text(json.dumps(manifest), encoding="utf-8")
+    os.replace(tmp, manifest_path)
+
+def ingest_folder(folder: Path, skills_path: Path, manifest_path: Optional[Path] = None,
+                  known_files: Optional[Iterable[str]] = None, workers: int = 1,
+                  timeout: Optional[float] = None, **parse_options) -> IngestResult:
+    """
+    Parse only the files that are new or changed since the last ingest.
+
+    A manifest of name -> (size, mtime, sha256) is kept at manifest_path
+    (default: <folder>/.parse_manifest.json). Files whose size and mtime
+    match are skipped without being read; if only the mtime moved, the hash
+    decides. A parser or vocabulary version change invalidates everything.
+    Files listed as unchanged but missing from `known_files` (e.g. a fresh
+    session) are parsed again so the caller can rebuild its view.
+    Error rows are not recorded, so those files are retried next time.
+    A .zip counts as one file here; its rows are named "<zip>/<member>"
+    (see source_file).
+    """
+    manifest_path = Path(manifest_path) if manifest_path else folder / MANIFEST_NAME
+    version = f"{PARSER_VERSION}.{TEXT_VERSION}:{get_vocabulary(skills_path).digest}"
+    manifest = _load_manifest(manifest_path)
+    previous = manifest.get("files", {}) if manifest.get("version") == version else {}
+    known = {source_file(f) for f in known_files} if known_files is not None else None
+
+    current: Dict[str, Dict] = {}
+    to_parse: List[Path] = []
+    changed: List[str] = []
+    unchanged: List[str] = []
+    for p in list_resume_files(folder):
+        st = p.stat()
+        entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        old = previous.get(p.name)
+        if old and old["size"] == entry["size"] and old["mtime_ns"] == entry["mtime_ns"]:
+            entry["sha256"] = old["sha256"]
+        else:
+            entry["sha256"] = _file_digest(p)
+        current[p.name] = entry
+
+        if old and old["sha256"] == entry["sha256"]:
+            unchanged.append(p.name)
+            if known is not None and p.name not in known:
+                to_parse.append(p)
+        else:
+            changed.append(p.name)
+            to_parse.append(p)
+
+    deleted = sorted(set(previous) - set(current))
+    records = list(iter_parse_paths(to_parse, skills_path, workers=workers,
+                                    timeout=timeout, **parse_options))
+    for r in records:
+        if r.error is not None:
+            current.pop(source_file(r.file), None)
+
+    _save_manifest(manifest_path, {"version": version, "files": current})
+    return IngestResult(records=records_to_frame(records), changed=changed,
+                        unchanged=unchanged, deleted=deleted)
+
+# ------------------------------------------------
+# Process Pool with Per-File Timeouts
+# ------------------------------------------------
+def _parse_worker(conn, skills_path: Path, options: Dict) -> None:
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        idx, work = task
+        conn.send((idx, _parse_task_safe(work, skills_path, options)))
+
+class _PoolWorker:
+    def __init__(self, ctx, skills_path: Path, options: Dict):
+        self.conn, child_conn = ctx.Pipe()
+        self.proc = ctx.Process(target=_parse_worker, args=(child_conn, skills_path, options), daemon=True)
+        self.proc.start()
+        child_conn.close()
+        self.task: Optional[Tuple[int, str, float]] = None
+
+    def submit(self, idx: int, task: ParseTask) -> None:
+        # Only the name is kept; archive members' bytes go down the pipe
+        self.task = (idx, _task_name(task), time.monotonic())
+        self.conn.send((idx, task))
+
+    def kill(self) -> None:
+        if self.proc.is_alive():
+            self.proc.kill()
+        self.proc.join()
+        self.conn.close()
+
+def _iter_parse_parallel(tasks: Iterable[ParseTask], skills_path: Path, workers: int,
+                         timeout: Optional[float], options: Dict) -> Iterator[ParsedResume]:
+    # Each worker gets its own pipe so killing a stuck worker cannot corrupt
+    # a queue shared with the others.
+    ctx = mp.get_context()
+    pool = [_PoolWorker(ctx, skills_path, options) for _ in range(workers)]
+    todo = iter(tasks)
+    exhausted = False
+    submitted = next_out = 0
+    done: Dict[int, ParsedResume] = {}
+    max_ahead = workers * 4
+    try:
+        while True:
+            for w in pool:
+                if w.task is None and not exhausted and submitted - next_out < max_ahead:
+                    try:
+                        task = next(todo)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    w.submit(submitted, task)
+                    submitted += 1
+
+            while next_out in done:
+                yield done.pop(next_out)
+                next_out += 1
+            if exhausted and next_out == submitted:
+                return
+
+            busy = [w for w in pool if w.task is not None]
+            wait_for = 0.5
+            if timeout is not None and busy:
+                now = time.monotonic()
+                wait_for = max(0.0, min(w.task[2] + timeout - now for w in busy))
+            ready = mp_connection.wait([w.conn for w in busy], timeout=wait_for)
+
+            for i, w in enumerate(pool):
+                if w.task is None:
+                    continue
+                idx, name, started = w.task
+                if w.conn in ready:
+                    try:
+                        got_idx, record = w.conn.recv()
+                        w.task = None
+                        done[got_idx] = record
+                        continue
+                    except (EOFError, OSError):
+                        reason = None
+                elif timeout is not None and time.monotonic() - started > timeout:
+                    reason = f"timed out after {timeout:g}s"
+                else:
+                    continue
+                w.kill()
+                if reason is None:
+                    reason = f"worker exited unexpectedly (code {w.proc.exitcode})"
+                done[idx] = ParsedResume(name, error=reason)
+                pool[i] = _PoolWorker(ctx, skills_path, options)
+    finally:
+        for w in pool:
+            try:
+                if w.task is None:
+                    w.conn.send(None)
+                    w.proc.join(timeout=1)
+            except (OSError, ValueError):
+                pass
+            w.kill()
@@ -0,0 +1,119 @@
+"""
+Record type returned by the parser.
+
+ParsedResume is a slotted dataclass: one small fixed-layout object per file
+instead of a 12-key dict. It still reads like the old dicts
+(record["skills"], record.get("error"), "cgpa" in record, dict(record)),
+so callers written against dicts keep working. Fields left as None were not
+extracted (e.g. skipped by a parse profile, or an error row) and are treated
+as missing keys everywhere, including to_dict and the DataFrame columns.
+"""
+from dataclasses import dataclass, fields
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+
+@dataclass(slots=True)
+class ParsedResume:
+    file: str
+    name: Optional[str] = None
+    contacts: Optional[Dict[str, str]] = None
+    skills: Optional[List[str]] = None
+    cgpa: Optional[str] = None
+    projects: Optional[List[str]] = None
+    projects_text: Optional[str] = None
+    experience: Optional[List[Dict]] = None
+    confidence: Optional[Dict[str, int]] = None
+    language: Optional[str] = None
+    minhash: Optional[str] = None        # hex MinHash signature, see dedup.py
+    duplicate_of: Optional[str] = None   # file this is a near-duplicate of
+    raw_text: Optional[str] = None
+    raw_text_ref: Optional[str] = None  # set instead of raw_text once moved to a text_store
+    error: Optional[str] = None
+    timings: Optional[Dict[str, float]] = None
+
+    # -----------------------------
+    # dict compatibility
+    # -----------------------------
+    def __getitem__(self, key: str):
+        value = getattr(self, key, None) if key in FIELD_NAMES else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value) -> None:
+        if key not in FIELD_NAMES:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in FIELD_NAMES and getattr(self, key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def get(self, key: str, default=None):
+        value = getattr(self, key, None) if key in FIELD_NAMES else None
+        return default if value is None else value
+
+    def keys(self) -> List[str]:
+        return [f for f in FIELD_NAMES if getattr(self, f) is not None]
+
+    def items(self) -> List[tuple]:
+        return [(f, v) for f in FIELD_NAMES for v in [getattr(self, f)] if v is not None]
+
+    # -----------------------------
+    # Serialisation
+    # -----------------------------
+    def to_dict(self) -> Dict:
+        """Plain dict of the populated fields (shallow; nested values are shared)."""
+        return {f: v for f in FIELD_NAMES for v in [getattr(self, f)] if v is not None}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ParsedResume":
+        """Build from a dict, e.g. a cached record or a Mongo document; unknown keys are ignored."""
+        return cls(**{k: v for k, v in data.items() if k in FIELD_NAMES})
+
+
+FIELD_NAMES = tuple(f.name for f in fields(ParsedResume))
+
+
+# -----------------------------
+# Columnar batches
+# -----------------------------
+def to_columns(records: Iterable[ParsedResume]) -> Dict[str, list]:
+    """
+    Field name -> list of values, one entry per record. Fields that no record
+    populated are left out, except "file", so even no records give a frame
+    callers can select by file.
+    """
+    records = list(records)
+    columns = {}
+    for f in FIELD_NAMES:
+        values = [getattr(r, f) for r in records]
+        if f == "file" or any(v is not None for v in values):
+            columns[f] = values
+    return columns
+
+
+def from_columns(columns: Dict[str, list]) -> List[ParsedResume]:
+    known = {k: v for k, v in columns.items() if k in FIELD_NAMES}
+    n = len(next(iter(known.values()), []))
+    return [ParsedResume(**{k: v[i] for k, v in known.items()}) for i in range(n)]
+
+
+def records_to_frame(records: Iterable[ParsedResume]) -> pd.DataFrame:
+    """DataFrame with one column per populated field, built column by column."""
+    return pd.DataFrame(to_columns(records))
+
+
+def frame_to_records(df: pd.DataFrame) -> List[ParsedResume]:
+    columns = {c: [None if _is_missing(v) else v for v in df[c].tolist()]
+               for c in df.columns if c in FIELD_NAMES}
+    return from_columns(columns)
+
+
+def _is_missing(value) -> bool:
+    # NaN fills the gaps pandas leaves in columns such as "error"
+    return isinstance(value, float) and value != value
@@ -1,17 +1,15 @@
+import os
 import re
+from pathlib import Path
 from typing import List, Dict
 import pandas as pd
 import requests
 from googlesearch import search
-import spacy
-from typing import List, Dict, Tuple
-
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Warning: spaCy model not found. Install with: python -m spacy download en_core_web_sm")
-    nlp = None
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+from nlp_models import get_nlp
+from domain_classifier import get_domain_classifier
+from search_cache import SQLiteSearchBackend, SearchCache, cached_search
+from enrichment import DEFAULT_MAX_WORKERS, DEFAULT_TIMEOUT, Enricher
 
 # Common domains
 COMMON_DOMAINS = [
@@ -22,91 +20,135 @@ COMMON_DOMAINS = [
     "natural language processing", "resume parsing", "notarization systems"
 ]
 
+# A domain is confirmed for a project above this confidence, whether that is
+# the classifier's calibrated confidence or the fallback's keyword overlap ratio
+DOMAIN_CONFIRM_THRESHOLD = 0.3
+
+# Repeated queries (e.g. rescoring the same batch) are answered from here
+SEARCH_CACHE = SearchCache.from_env(
+    SQLiteSearchBackend(Path(os.environ.get("SEARCH_CACHE_PATH", ".search_cache.sqlite"))))
+
+@cached_search(SEARCH_CACHE, "scoring")
 def web_search_extract_keywords(query: str, top_n: int = 3) -> List[str]:
-    """Extract keywords from Google search results using googlesearch-python"""
+    """
+    Extract keywords from Google search results using googlesearch-python.
+    Search errors propagate (and are not cached); WEB_ENRICHER drops those
+    projects, which then keep their local keywords.
+    """
     keywords = set()
-    try:
-        results = list(search(query, num_results=top_n, lang="en"))
-        text_blob = " ".join([result.title + " " + result.description for result in results if hasattr(result, 'title') and result.title])
-        
-        if not text_blob:
-            print(f"No search results for query: {query}")
-            return []
-        
-        if nlp:
-            doc = nlp(text_blob)
-            for chunk in doc.noun_chunks:
-                if len(chunk.text) > 2 and not chunk.text.lower() in {'the', 'and', 'for', 'with', 'using'}:
-                    keywords.add(chunk.text.lower())
-            for ent in doc.ents:
-                if ent.label_ in {'ORG', 'PRODUCT', 'EVENT'}:
-                    keywords.add(ent.text.lower())
-        else:
-            tokens = re.findall(r'\b[a-zA-Z]{3,}\b', text_blob.lower())
-            keywords = set(tokens[:20])
-        
-        print(f"Search for '{query}': Extracted {len(keywords)} keywords (e.g., {list(keywords)[:3]})")
-        return list(keywords)
-    except Exception as e:
-        print(f"Web search failed for '{query}': {e}. Falling back to local keywords.")
+    results = list(search(query, num_results=top_n, lang="en"))
+    text_blob = " ".join([result.title + " " + result.description for result in results if hasattr(result, 'title') and result.title])
+    
+    if not text_blob:
+        print(f"No search results for query: {query}")
         return []
+    
+    nlp = get_nlp()
+    if nlp:
+        doc = nlp(text_blob)
+        for chunk in doc.noun_chunks:
+            if len(chunk.text) > 2 and not chunk.text.lower() in {'the', 'and', 'for', 'with', 'using'}:
+                keywords.add(chunk.text.lower())
+        for ent in doc.ents:
+            if ent.label_ in {'ORG', 'PRODUCT', 'EVENT'}:
+                keywords.add(ent.text.lower())
+    else:
+        tokens = re.findall(r'\b[a-zA-Z]{3,}\b', text_blob.lower())
+        keywords = set(tokens[:20])
+    
+    print(f"Search for '{query}': Extracted {len(keywords)} keywords (e.g., {list(keywords)[:3]})")
+    return list(keywords)
 
 def confirm_domain_match(project_keywords: set, domain: str) -> Tuple[bool, float]:
     """Confirm if project relates to domain via keyword overlap"""
     domain_toks = set(re.findall(r'\b[a-zA-Z]{3,}\b', domain.lower()))
     overlap = len(project_keywords & domain_toks)
     confidence = overlap / max(1, len(domain_toks))
-    confirmed = confidence > 0.3
+    confirmed = confidence > DOMAIN_CONFIRM_THRESHOLD
     return confirmed, confidence
 
-def infer_project_domains(projects: List[str], use_web_search: bool = True) -> Dict[str, Dict[str, any]]:
+def spacy_keywords(doc) -> Set[str]:
+    keywords = set()
+    for chunk in doc.noun_chunks:
+        if len(chunk.text) > 2:
+            keywords.add(chunk.text.lower())
+    for ent in doc.ents:
+        keywords.add(ent.text.lower())
+    return keywords
+
+def project_keywords_batch(texts: Iterable[str], batch_size: int = 64,
+                           n_process: int = 1) -> Dict[str, FrozenSet[str]]:
     """
-    Infer and confirm domains for projects using web search.
-    Returns: {project_key: {"domains": [top_domains], "confirmed": bool, "confidence": float}}
+    spaCy keywords (noun chunks and entities) for many project texts in one
+    nlp.pipe run. Each distinct text is processed once; returns text -> keywords.
     """
-    domains_per_project = {}
+    unique = list(dict.fromkeys(t for t in texts if isinstance(t, str) and t.strip()))
+    nlp = get_nlp()
+    if not nlp:
+        return {t: frozenset() for t in unique}
+    docs = nlp.pipe(unique, batch_size=batch_size, n_process=n_process)
+    return {t: frozenset(spacy_keywords(doc)) for t, doc in zip(unique, docs)}
+
+def project_search_query(project: str) -> str:
+    query_terms = [t for t in re.findall(r'\b[a-zA-Z]{3,}\b', project.lower()) if t not in {'for', 'and', 'the', 'a', 'an'}][:5]
+    return f"what software domain or technology stack for project: {project[:120]} {' '.join(query_terms)} examples"
+
+# Runs a batch's searches concurrently; the lambda looks the search function up at call time
+WEB_ENRICHER = Enricher(lambda query, top_n: web_search_extract_keywords(query, top_n),
+                        max_workers=int(os.environ.get("WEB_SEARCH_CONCURRENCY", DEFAULT_MAX_WORKERS)),
+                        timeout=float(os.environ.get("WEB_SEARCH_TIMEOUT", DEFAULT_TIMEOUT)))
+
+def search_projects_keywords(projects: List[str], enricher: Optional[Enricher] = None) -> Dict[str, List[str]]:
+    """Web search keywords per project, all searches in flight at once; failed or late ones are left out."""
+    queries = {p: project_search_query(p) for p in projects}
+    found = (enricher or WEB_ENRICHER).enrich(queries.values(), top_n=5)
+    web_keywords = {}
+    for project, query in queries.items():
+        if query in found:
+            web_keywords[project] = found[query]
+            print(f"Web search for '{project[:30]}...': Query='{query}', Enriched with {len(found[query])} keywords")
+    return web_keywords
+
+def infer_project_domains(projects: List[str], use_web_search: bool = False,
+                          project_keywords: Optional[Dict[str, FrozenSet[str]]] = None,
+                          enricher: Optional[Enricher] = None,
+                          web_keywords: Optional[Dict[str, List[str]]] = None) -> Dict[str, Dict[str, any]]:
+    """
+    Infer domains for projects with the offline classifier in
+    domain_classifier.py: every project is scored in one vectorised call.
+    use_web_search: first add web search keywords to each project's text
+    (one query per project, run concurrently by `enricher`, WEB_ENRICHER by
+    default; see refine_project_domains).
+    web_keywords: precomputed search_projects_keywords output for a whole
+    batch; used instead of searching, and projects missing from it stay local.
+    Without scikit-learn this falls back to keyword overlap, using
+    project_keywords from project_keywords_batch for the spaCy keywords.
+    Returns: {project_key: {"domains": [top_domains], "confirmed": bool, "confidence": float, "source": str}}
+    where confidence (0-1) is the mean over the confirmed domains.
+    """
+    projects = [p for p in projects if isinstance(p, str) and p.strip()]
+    if web_keywords is None:
+        web_keywords = search_projects_keywords(projects, enricher) if use_web_search else {}
     
-    for project in projects:
-        if not project.strip():
-            continue
-        
-        project_key = project[:50] + "..."
-        
-        # Local keywords from project text
-        local_keywords = set()
-        if nlp:
-            doc = nlp(project)
-            for chunk in doc.noun_chunks:
-                if len(chunk.text) > 2:
-                    local_keywords.add(chunk.text.lower())
-            for ent in doc.ents:
-                local_keywords.add(ent.text.lower())
-        local_keywords.update(set(tokenize(project)))
-        
-        # Enrich with web search
-        enriched_keywords = local_keywords.copy()
-        if use_web_search:
-            query_terms = [t for t in re.findall(r'\b[a-zA-Z]{3,}\b', project.lower()) if t not in {'for', 'and', 'the', 'a', 'an'}][:5]
-            query = f"what software domain or technology stack for project: {project[:120]} {' '.join(query_terms)} examples"
-            search_keywords = web_search_extract_keywords(query, top_n=5)
-            enriched_keywords.update(search_keywords)
-            print(f"Web search for '{project[:30]}...': Query='{query}', Enriched with {len(search_keywords)} keywords")
-        
-        # Match and confirm domains
-        domain_scores = {}
-        for domain in COMMON_DOMAINS:
-            confirmed, conf = confirm_domain_match(enriched_keywords, domain)
-            if confirmed:
-                domain_scores[domain] = conf
-        
+    classifier = get_domain_classifier()
+    if classifier is not None:
+        texts = [" ".join([p, *web_keywords.get(p, ())]) for p in projects]
+        scores_per_project = [dict(matches) for matches in
+                              classifier.predict(texts, min_confidence=DOMAIN_CONFIRM_THRESHOLD)]
+    else:
+        scores_per_project = overlap_domain_scores(projects, project_keywords, web_keywords)
+    
+    domains_per_project = {}
+    for project, domain_scores in zip(projects, scores_per_project):
         # Top confirmed domains
         top_domains = [d for d, _ in sorted(domain_scores.items(), key=lambda x: x[1], reverse=True)[:3]]
         overall_confidence = sum(domain_scores.values()) / max(1, len(domain_scores)) if domain_scores else 0.0
         
-        domains_per_project[project_key] = {
+        domains_per_project[project[:50] + "..."] = {
             "domains": top_domains,
             "confirmed": bool(top_domains),
-            "confidence": round(overall_confidence, 2)
+            "confidence": round(overall_confidence, 2),
+            "source": "web" if project in web_keywords else "local",
         }
     
     if not domains_per_project:
@@ -114,6 +156,56 @@ def infer_project_domains(projects: List[str], use_web_search: bool = True) -> D
     
     return domains_per_project
 
+def overlap_domain_scores(projects: List[str], project_keywords: Optional[Dict[str, FrozenSet[str]]] = None,
+                          web_keywords: Optional[Dict[str, List[str]]] = None) -> List[Dict[str, float]]:
+    """Keyword-overlap domain scores, used when the classifier is unavailable."""
+    project_keywords = project_keywords or {}
+    web_keywords = web_keywords or {}
+    missing = [p for p in projects if p not in project_keywords]
+    if missing:
+        project_keywords = {**project_keywords, **project_keywords_batch(missing)}
+    
+    scores_per_project = []
+    for project in projects:
+        # Local keywords from project text
+        keywords = set(project_keywords.get(project, ()))
+        keywords.update(tokenize(project))
+        keywords.update(web_keywords.get(project, ()))
+        
+        domain_scores = {}
+        for domain in COMMON_DOMAINS:
+            confirmed, conf = confirm_domain_match(keywords, domain)
+            if confirmed:
+                domain_scores[domain] = conf
+        scores_per_project.append(domain_scores)
+    return scores_per_project
+
+def refine_project_domains(projects: List[str], enricher: Optional[Enricher] = None,
+                           web_keywords: Optional[Dict[str, List[str]]] = None) -> Dict[str, Dict[str, any]]:
+    """
+    Web-enriched project domains. Scoring uses the local classifier only;
+    run this afterwards (e.g. as a background task) and replace the stored
+    project_domains with its result when it finishes.
+    """
+    return infer_project_domains(projects, use_web_search=True, enricher=enricher, web_keywords=web_keywords)
+
+def refine_frame_domains(df: pd.DataFrame, enricher: Optional[Enricher] = None) -> Dict[str, Dict[str, Dict[str, any]]]:
+    """
+    refine_project_domains for every resume in a parsed DataFrame:
+    file -> project_domains, to replace the local results of score_dataframe.
+    """
+    projects_by_file = {}
+    if "projects" in df.columns:
+        for file, projects in zip(df["file"], df["projects"]):
+            if isinstance(projects, list) and projects:
+                projects_by_file[file] = projects
+    # The whole frame's searches run at once, and only once: a failed or late
+    # search is not cached, so resumes must not search again on their own
+    web_keywords = search_projects_keywords(list(dict.fromkeys(
+        p for ps in projects_by_file.values() for p in ps if isinstance(p, str) and p.strip())), enricher)
+    return {file: refine_project_domains(projects, enricher, web_keywords)
+            for file, projects in projects_by_file.items()}
+
 def tokenize(text: str) -> List[str]:
     return re.findall(r"[a-zA-Z+#\.]{2,}", text.lower())
 
@@ -122,7 +214,10 @@ def keywords_from_jd(jd: str) -> List[str]:
     stop = set(["and","or","with","the","a","an","to","of","in","on","for","using","experience","skills","skill","developer","engineer","analyst"])
     return [t for t in toks if t not in stop]
 
-def score_resume(resume: Dict, jd: str) -> Dict:
+def score_resume(resume: Dict, jd: str,
+                 project_keywords: Optional[Dict[str, FrozenSet[str]]] = None,
+                 use_web_search: bool = False,
+                 web_keywords: Optional[Dict[str, List[str]]] = None) -> Dict:
     # Safely handle skills, converting non-iterable types to empty list
     skills_value = resume.get("skills", [])
     if not isinstance(skills_value, (list, tuple)):
@@ -138,7 +233,8 @@ def score_resume(resume: Dict, jd: str) -> Dict:
     score = int(round(coverage * 100))
     missing = sorted(list(jd_keys - (res_keys | res_tokens)))
     
-    project_domains = infer_project_domains(resume.get("projects", []))
+    project_domains = infer_project_domains(resume.get("projects", []), use_web_search=use_web_search,
+                                            project_keywords=project_keywords, web_keywords=web_keywords)
     
     return {
         "score": score,
@@ -147,14 +243,47 @@ def score_resume(resume: Dict, jd: str) -> Dict:
         "project_domains": project_domains
     }
 
-def score_dataframe(df: pd.DataFrame, jd: str) -> pd.DataFrame:
-    out = []
-    for _, row in df.iterrows():
-        if isinstance(row.get("error"), str):
-            out.append({"file": row["file"], "score": 0, "missing": [], "matched": [], "error": row["error"]})
+def iter_score_records(records: Iterable[Dict], jd: str,
+                       project_keywords: Optional[Dict[str, FrozenSet[str]]] = None,
+                       use_web_search: bool = False,
+                       web_keywords: Optional[Dict[str, List[str]]] = None) -> Iterator[Dict]:
+    """
+    Score parsed records one at a time, e.g. straight from parser.iter_parse_folder.
+    A near-duplicate (duplicate_of set) reuses the score of the resume it
+    duplicates when that one was scored earlier in the same run.
+    project_keywords: precomputed project_keywords_batch output, if any.
+    use_web_search, web_keywords: see infer_project_domains.
+    """
+    scored = {}
+    for record in records:
+        if isinstance(record.get("error"), str):
+            yield {"file": record["file"], "score": 0, "missing": [], "matched": [], "error": record["error"]}
+            continue
+        original = record.get("duplicate_of")
+        if isinstance(original, str) and original in scored:
+            yield {**scored[original], "file": record["file"], "duplicate_of": original}
             continue
-        s = score_resume(row.to_dict(), jd)
-        out.append({"file": row["file"], **s})
+        s = score_resume(record, jd, project_keywords, use_web_search, web_keywords)
+        scored[record["file"]] = s
+        yield {"file": record["file"], **s}
+
+def score_dataframe(df: pd.DataFrame, jd: str, batch_size: int = 64, n_process: int = 1,
+                    use_web_search: bool = False) -> pd.DataFrame:
+    project_keywords = None
+    if get_domain_classifier() is None:
+        # Keyword-overlap fallback: every project in the frame goes through spaCy in one nlp.pipe run
+        projects = df["projects"] if "projects" in df.columns else []
+        project_keywords = project_keywords_batch(
+            (p for ps in projects if isinstance(ps, list) for p in ps),
+            batch_size=batch_size, n_process=n_process)
+    web_keywords = None
+    if use_web_search and "projects" in df.columns:
+        # Fire the whole frame's searches at once and hand the results to every
+        # resume: failed or late searches are not cached, so must not be retried per resume
+        web_keywords = search_projects_keywords(list(dict.fromkeys(
+            p for ps in df["projects"] if isinstance(ps, list) for p in ps if isinstance(p, str) and p.strip())))
+    out = list(iter_score_records((row.to_dict() for _, row in df.iterrows()), jd, project_keywords,
+                                  use_web_search, web_keywords))
     return pd.DataFrame(out).sort_values("score", ascending=False).reset_index(drop=True)
 
 def summarize(text: str, max_sentences: int = 3) -> str:
@@ -0,0 +1,224 @@
+"""
+TTL cache for web search keyword lookups.
+
+Results are keyed on the normalised query (case and whitespace folded) plus
+the caller's namespace and top_n, and kept in an in-process LRU in front of
+an optional persistent backend: a SQLite file (SQLiteSearchBackend) or a
+Mongo collection with a TTL index (MongoSearchBackend). Empty results are
+cached too, under their own, shorter TTL, so a query that found nothing is
+retried sooner than one that did.
+
+    SEARCH_CACHE = SearchCache(SQLiteSearchBackend(Path(".search_cache.sqlite")))
+
+    @cached_search(SEARCH_CACHE, "scoring")
+    def web_search_extract_keywords(query: str, top_n: int = 3) -> List[str]:
+        ...
+
+Exceptions raised by the wrapped function propagate and are not cached;
+the caller decides on a fallback.
+"""
+import datetime
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+DEFAULT_HIT_TTL = 7 * 24 * 3600     # seconds
+DEFAULT_NEGATIVE_TTL = 15 * 60
+DEFAULT_MAXSIZE = 4096
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    return _SPACE_RE.sub(" ", query).strip().lower()
+
+
+def cache_key(namespace: str, query: str, top_n: int) -> str:
+    return f"{namespace}:{top_n}:{normalize_query(query)}"
+
+
+# -----------------------------
+# Persistent backends
+# -----------------------------
+class SQLiteSearchBackend:
+    """
+    One row per key in a local SQLite file; the connection opens on first
+    use. Expired rows are purged when it opens and every purge_every writes.
+    """
+
+    def __init__(self, path: Path, purge_every: int = 1000):
+        self.path = Path(path)
+        self.purge_every = max(1, purge_every)
+        self._writes = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("CREATE TABLE IF NOT EXISTS search_cache ("
+                         "key TEXT PRIMARY KEY, keywords TEXT NOT NULL, expires_at REAL NOT NULL)")
+            self._conn = conn
+            self._purge(conn, time.time())
+        return self._conn
+
+    @staticmethod
+    def _purge(conn: sqlite3.Connection, now: float) -> int:
+        cur = conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,))
+        conn.commit()
+        return cur.rowcount
+
+    def get(self, key: str) -> Optional[Tuple[List[str], float]]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT keywords, expires_at FROM search_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put(self, key: str, keywords: List[str], expires_at: float) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("INSERT OR REPLACE INTO search_cache (key, keywords, expires_at) VALUES (?, ?, ?)",
+                         (key, json.dumps(keywords), expires_at))
+            conn.commit()
+            self._writes += 1
+            if self._writes % self.purge_every == 0:
+                self._purge(conn, time.time())
+
+    def purge(self, now: Optional[float] = None) -> int:
+        """Delete expired rows; returns how many were removed."""
+        with self._lock:
+            return self._purge(self._connect(), now or time.time())
+
+
+class MongoSearchBackend:
+    """
+    {_id: key, keywords, expires_at} documents. The TTL index lets Mongo
+    drop expired entries itself; reads still check expires_at because the
+    TTL monitor only runs about once a minute. The index is created on
+    first use, so constructing the backend never talks to the server.
+    """
+
+    def __init__(self, collection):
+        self.col = collection
+        self._indexed = False
+
+    def _ensure_index(self) -> None:
+        if not self._indexed:
+            self.col.create_index("expires_at", expireAfterSeconds=0)
+            self._indexed = True
+
+    def get(self, key: str) -> Optional[Tuple[List[str], float]]:
+        self._ensure_index()
+        doc = self.col.find_one({"_id": key})
+        if not doc:
+            return None
+        expires_at = doc["expires_at"].replace(tzinfo=datetime.timezone.utc).timestamp()
+        return doc["keywords"], expires_at
+
+    def put(self, key: str, keywords: List[str], expires_at: float) -> None:
+        self._ensure_index()
+        when = datetime.datetime.fromtimestamp(expires_at, tz=datetime.timezone.utc)
+        self.col.update_one({"_id": key}, {"$set": {"keywords": keywords, "expires_at": when}}, upsert=True)
+
+
+# -----------------------------
+# Cache
+# -----------------------------
+class SearchCache:
+    def __init__(self, backend=None, hit_ttl: float = DEFAULT_HIT_TTL,
+                 negative_ttl: float = DEFAULT_NEGATIVE_TTL, maxsize: int = DEFAULT_MAXSIZE):
+        self.backend = backend
+        self.hit_ttl = hit_ttl
+        self.negative_ttl = negative_ttl
+        self.maxsize = maxsize
+        self._lru: "OrderedDict[str, Tuple[List[str], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls, backend=None) -> "SearchCache":
+        """TTLs from SEARCH_CACHE_HIT_TTL / SEARCH_CACHE_NEGATIVE_TTL (seconds), if set."""
+        return cls(backend,
+                   hit_ttl=float(os.environ.get("SEARCH_CACHE_HIT_TTL", DEFAULT_HIT_TTL)),
+                   negative_ttl=float(os.environ.get("SEARCH_CACHE_NEGATIVE_TTL", DEFAULT_NEGATIVE_TTL)))
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """Cached keywords (possibly []) for a key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._lru.move_to_end(key)
+                    self.hits += 1
+                    return list(entry[0])
+                del self._lru[key]
+        entry = self._backend_get(key)
+        if entry is not None and entry[1] > now:
+            self._remember(key, entry)
+            with self._lock:
+                self.hits += 1
+            return list(entry[0])
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, keywords: List[str]) -> None:
+        ttl = self.hit_ttl if keywords else self.negative_ttl
+        entry = (list(keywords), time.time() + ttl)
+        self._remember(key, entry)
+        if self.backend is not None:
+            try:
+                self.backend.put(key, entry[0], entry[1])
+            except Exception as e:
+                print(f"Search cache write failed for '{key}': {e}")
+
+    def clear(self) -> None:
+        """Forget the in-process entries (the persistent backend is left alone)."""
+        with self._lock:
+            self._lru.clear()
+
+    def _remember(self, key: str, entry: Tuple[List[str], float]) -> None:
+        with self._lock:
+            self._lru[key] = entry
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+
+    def _backend_get(self, key: str) -> Optional[Tuple[List[str], float]]:
+        if self.backend is None:
+            return None
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            print(f"Search cache read failed for '{key}': {e}")
+            return None
+
+
+def cached_search(cache: SearchCache, namespace: str) -> Callable:
+    """
+    Decorator for fn(query, top_n) -> List[str]. The undecorated function
+    stays reachable as fn.__wrapped__.
+    """
+    def decorate(fn: Callable[..., List[str]]) -> Callable[..., List[str]]:
+        @wraps(fn)
+        def wrapper(query: str, top_n: int = 3) -> List[str]:
+            key = cache_key(namespace, query, top_n)
+            keywords = cache.get(key)
+            if keywords is None:
+                keywords = fn(query, top_n)
+                cache.put(key, keywords)
+            return keywords
+        return wrapper
+    return decorate
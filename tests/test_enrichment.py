@@ -0,0 +1,127 @@
+"""Enricher and web-enriched domain inference against a local stub search provider (no network)."""
+import threading
+import time
+
+import pytest
+
+from enrichment import Enricher
+
+
+class StubSearch:
+    """fn(query, top_n) that records calls and how many ran at once."""
+
+    def __init__(self, delay: float = 0.05, slow: float = 2.0, gate: threading.Event = None):
+        self.delay = delay
+        self.slow = slow
+        self.gate = gate
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, query: str, top_n: int):
+        with self._lock:
+            self.calls.append(query)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            if self.gate is not None:
+                self.gate.wait(5)
+            time.sleep(self.slow if "slow" in query else self.delay)
+            if "boom" in query:
+                raise RuntimeError("search provider down")
+            return ["tensorflow", "deep learning"]
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def make_enricher():
+    made = []
+
+    def make(search_fn, **kwargs):
+        enricher = Enricher(search_fn, **kwargs)
+        made.append(enricher)
+        return enricher
+
+    yield make
+    for enricher in made:
+        enricher.shutdown()
+
+
+def test_concurrency_is_capped(make_enricher):
+    stub = StubSearch(delay=0.1)
+    enricher = make_enricher(stub, max_workers=3, timeout=5)
+    queries = [f"query {i}" for i in range(10)]
+    results = enricher.enrich(queries)
+    assert set(results) == set(queries)
+    assert len(stub.calls) == 10
+    assert stub.peak == 3
+
+
+def test_identical_in_flight_queries_are_coalesced(make_enricher):
+    gate = threading.Event()
+    stub = StubSearch(gate=gate)
+    enricher = make_enricher(stub, max_workers=4, timeout=5)
+    results = {}
+
+    def run(i):
+        results[i] = enricher.enrich(["same query", "Same   QUERY"])
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(5)]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert len(stub.calls) == 1
+    assert all(r == {"same query": ["tensorflow", "deep learning"],
+                     "Same   QUERY": ["tensorflow", "deep learning"]} for r in results.values())
+
+
+def test_slow_query_is_dropped_at_deadline(make_enricher):
+    stub = StubSearch(slow=1.0)
+    enricher = make_enricher(stub, max_workers=4, timeout=0.3)
+    start = time.monotonic()
+    results = enricher.enrich(["slow query", "fast query"])
+    assert time.monotonic() - start < 0.9
+    assert set(results) == {"fast query"}
+
+
+def test_failing_query_is_dropped(make_enricher):
+    enricher = make_enricher(StubSearch(), max_workers=4, timeout=5)
+    assert set(enricher.enrich(["boom query", "fine query"])) == {"fine query"}
+
+
+def test_queued_searches_are_cancelled_after_deadline(make_enricher):
+    stub = StubSearch(slow=0.5)
+    enricher = make_enricher(stub, max_workers=1, timeout=0.1)
+    assert enricher.enrich(["slow query", "queued 1", "queued 2"]) == {}
+    time.sleep(0.7)
+    assert stub.calls == ["slow query"]
+
+
+def test_infer_project_domains_marks_only_completed_searches_as_web(make_enricher):
+    scoring = pytest.importorskip("scoring")
+    enricher = make_enricher(StubSearch(), max_workers=4, timeout=5)
+    projects = ["Image classifier with CNN layers", "boom: Chat app in React"]
+    domains = scoring.infer_project_domains(projects, use_web_search=True, enricher=enricher)
+    sources = {key: value["source"] for key, value in domains.items()}
+    assert sources == {projects[0][:50] + "...": "web", projects[1][:50] + "...": "local"}
+
+
+def test_refine_frame_domains_searches_each_project_once(make_enricher):
+    scoring = pytest.importorskip("scoring")
+    pd = pytest.importorskip("pandas")
+    stub = StubSearch(slow=0.5)
+    enricher = make_enricher(stub, max_workers=4, timeout=0.2)
+    shared = ["boom: Chat app in React", "slow: Image classifier with CNN layers"]
+    df = pd.DataFrame({"file": ["a.pdf", "b.pdf", "c.pdf"],
+                       "projects": [shared, shared, shared + ["Resume parser with spaCy"]]})
+    start = time.monotonic()
+    refined = scoring.refine_frame_domains(df, enricher)
+    assert time.monotonic() - start < 1.0
+    assert len(stub.calls) == 3
+    assert [v["source"] for v in refined["c.pdf"].values()] == ["local", "local", "web"]
@@ -0,0 +1,131 @@
+"""
+Out-of-band storage for resume raw_text.
+
+Records keep only raw_text_ref, the SHA-256 of the text, and the text itself
+lives gzip-compressed in a store: files on disk (FileTextStore) or a Mongo
+blob collection (MongoTextStore). Identical texts share one entry, and the
+same ref resolves in either store, so callers can look it up in several.
+"""
+import gzip
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from records import ParsedResume
+
+
+def text_ref(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class FileTextStore:
+    """Content-addressed gzip files under root/<ref[:2]>/<ref>.txt.gz"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, ref: str) -> Path:
+        return self.root / ref[:2] / f"{ref}.txt.gz"
+
+    def has(self, ref: str) -> bool:
+        return self._path(ref).exists()
+
+    def put(self, text: str) -> str:
+        ref = text_ref(text)
+        path = self._path(ref)
+        if path.exists():
+            return ref
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(text.encode("utf-8")))
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Could not store text {ref[:12]}: {e}")
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+        return ref
+
+    def get(self, ref: str) -> Optional[str]:
+        try:
+            return gzip.decompress(self._path(ref).read_bytes()).decode("utf-8")
+        except (OSError, EOFError):
+            return None
+
+
+class MongoTextStore:
+    """One document per text: {_id: ref, data: gzip bytes, size: characters}"""
+
+    def __init__(self, collection):
+        self.col = collection
+
+    def has(self, ref: str) -> bool:
+        return self.col.count_documents({"_id": ref}, limit=1) > 0
+
+    def put(self, text: str) -> str:
+        ref = text_ref(text)
+        self.col.update_one(
+            {"_id": ref},
+            {"$setOnInsert": {"data": gzip.compress(text.encode("utf-8")), "size": len(text)}},
+            upsert=True,
+        )
+        return ref
+
+    def get(self, ref: str) -> Optional[str]:
+        doc = self.col.find_one({"_id": ref})
+        if not doc:
+            return None
+        return gzip.decompress(doc["data"]).decode("utf-8")
+
+
+# -----------------------------
+# Moving text out of records
+# -----------------------------
+def offload_raw_text(record: ParsedResume, store) -> ParsedResume:
+    """Replace record.raw_text with a raw_text_ref into `store` (in place)."""
+    if record.raw_text is not None:
+        record.raw_text_ref = store.put(record.raw_text)
+        record.raw_text = None
+    return record
+
+
+def offload_frame(df: pd.DataFrame, store) -> pd.DataFrame:
+    """
+    Same as offload_raw_text for a DataFrame's raw_text column. Rows without
+    inline text (e.g. records offloaded earlier) keep their raw_text_ref.
+    """
+    if "raw_text" not in df.columns:
+        return df
+    old_refs = df["raw_text_ref"] if "raw_text_ref" in df.columns else [None] * len(df)
+    refs = [store.put(t) if isinstance(t, str) else (old if isinstance(old, str) else None)
+            for t, old in zip(df["raw_text"], old_refs)]
+    df = df.drop(columns=["raw_text"])
+    df["raw_text_ref"] = refs
+    return df
+
+
+def load_raw_text(record, *stores) -> str:
+    """
+    Inline raw_text if the record (dict, ParsedResume or DataFrame row) still
+    has it, else the first store that holds its raw_text_ref; "" if neither.
+    """
+    text = record.get("raw_text")
+    if isinstance(text, str):
+        return text
+    ref = record.get("raw_text_ref")
+    if isinstance(ref, str):
+        for store in stores:
+            if store is None:
+                continue
+            text = store.get(ref)
+            if text is not None:
+                return text
+    return ""